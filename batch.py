@@ -0,0 +1,69 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		batch.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Batch executable, runs manifest jobs in parallel
+#
+#	Usage: batch.py <manifest> [--jobs=<n>] [--opt-level=<n>]
+#				   [--max-instructions=<n>] [--timeout=<seconds>]
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from sys import stderr, stdout
+from argparse import ArgumentParser
+
+from src.batch import BatchRunner
+from src.optimizer import Optimizer
+from src.exceptions import InterpreterError, ArgumentsError
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Main
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+	"""Main function
+
+	Returns:
+		int -- 0 if all jobs succeeded, 1 if some failed, error code otherwise
+	"""
+
+	parser = ArgumentParser(description="Runs IPPcode18 programs listed in a manifest "
+									   "in parallel and prints results as JSON lines")
+	parser.add_argument('manifest', help="file with one JSON job per line")
+	parser.add_argument('-j', '--jobs', type=int, default=None,
+						help="number of worker processes (default number of cores)")
+	parser.add_argument('-O', '--opt-level', type=int, default=Optimizer.DEFAULT_LEVEL,
+						help="optimization level of the interpreter")
+	parser.add_argument('--max-instructions', type=int, default=None,
+						help="stop jobs after the number of executed instructions")
+	parser.add_argument('--timeout', type=float, default=None,
+						help="stop jobs running longer than the number of seconds")
+	args = parser.parse_args()
+
+	try:
+		if args.jobs is not None and args.jobs < 1:
+			raise ArgumentsError("number of jobs has to be positive")
+		if not 0 <= args.opt_level <= Optimizer.MAX_LEVEL:
+			raise ArgumentsError("optimization level has to be 0 to {}".format(Optimizer.MAX_LEVEL))
+		if args.max_instructions is not None and args.max_instructions < 1:
+			raise ArgumentsError("instruction limit has to be positive")
+		if args.timeout is not None and not args.timeout > 0:
+			raise ArgumentsError("timeout has to be positive")
+
+		runner = BatchRunner(args.manifest, processes=args.jobs, opt_level=args.opt_level,
+							 max_instructions=args.max_instructions, timeout=args.timeout)
+		return 0 if runner.run(stdout) else 1
+	except InterpreterError as e:
+		print("[ ERROR ]", e, file=stderr)
+		return e.code
+
+
+if __name__ == '__main__':
+	exit(main())
@@ -0,0 +1,120 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		escapes.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Escape sequence decoding benchmark with a check of results
+#		   against the reference regex based decoding
+#
+#	Usage: python -m benchmarks.escapes
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import random
+
+from time import perf_counter
+
+from benchmarks.parser import LEGACY_STRING_REGEX, LEGACY_ESCAPE_REGEX, legacy_decode_string
+from src.strings import String
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+DISTINCT_LITERALS = 500
+REPEATS = 40
+LITERAL_LENGTH = 400
+
+# Legacy decoding took only the last two digits of an escape code and used
+# the character as a substitution template, which fails for a backslash
+# (any code ending with 92), so such codes are left out
+ESCAPE_CODES = [code for code in range(1000) if code % 100 != ord("\\")]
+
+
+def reference_decode_string(text: str) -> str:
+	"""Decodes a literal with the previous regex validation and a per-match
+	   substitution, which is correct for well-formed escape sequences
+
+	Arguments:
+		text {str} -- string literal
+
+	Returns:
+		str -- decoded string, None if the literal is invalid
+	"""
+
+	if not LEGACY_STRING_REGEX.match(text):
+		return None
+
+	return LEGACY_ESCAPE_REGEX.sub(lambda match: chr(int(match.group()[1:])), text)
+
+
+def build_literals(rng: object) -> list:
+	"""Builds escape-heavy literals, every third character is escaped
+
+	Arguments:
+		rng {object} -- random number generator
+
+	Returns:
+		list -- string literals
+	"""
+
+	literals = list()
+
+	for _ in range(DISTINCT_LITERALS):
+		chunks = list()
+		while sum(map(len, chunks)) < LITERAL_LENGTH:
+			chunks.append(rng.choice("abcXYZ_#~"))
+			chunks.append(rng.choice("ab"))
+			chunks.append("\\{:03d}".format(rng.choice(ESCAPE_CODES)))
+		literals.append("".join(chunks))
+
+	return literals
+
+
+def measure(function: object, literals: list) -> float:
+	"""Measures time of decoding every literal repeatedly
+
+	Arguments:
+		function {object} -- decoding function
+		literals {list} -- string literals
+
+	Returns:
+		float -- time in seconds
+	"""
+
+	start = perf_counter()
+	for _ in range(REPEATS):
+		for literal in literals:
+			function(literal)
+	return perf_counter() - start
+
+
+def main():
+	literals = build_literals(random.Random(18))
+
+	mismatches = [
+		literal for literal in literals
+		if String.decode(literal) != reference_decode_string(literal)
+	]
+	print("checked {} literals against reference decoding, {} mismatches".format(
+		len(literals), len(mismatches)
+	))
+
+	for name, function in (
+		("legacy", legacy_decode_string),
+		("linear", String.decode),
+		("memoized", String.parse),
+	):
+		print("{:>10} {:>10.1f} ms".format(name, measure(function, literals) * 1e3))
+
+	return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+	exit(main())
@@ -0,0 +1,105 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		jump.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Benchmark of jump cost depending on the program size
+#
+#	Usage: python -m benchmarks.jump
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import gc
+
+from os import remove
+from time import perf_counter
+
+from benchmarks.program import ProgramBuilder
+from src.interpreter import Interpreter
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+PROGRAM_SIZES = (100, 1000, 10000, 100000)
+ITERATIONS = 100000
+REPEAT = 5
+
+
+def build_program(size: int, iterations: int) -> str:
+	"""Builds a program with a loop placed after a given number of instructions
+
+	Arguments:
+		size {int} -- number of filler instructions preceding the loop
+		iterations {int} -- number of loop iterations (taken jumps)
+
+	Returns:
+		str -- path to the program file
+	"""
+
+	program = ProgramBuilder()
+	program.add("DEFVAR", "GF@i")
+	program.add("DEFVAR", "GF@f")
+	program.add("MOVE", "GF@i", "int@0")
+
+	for _ in range(size):
+		program.add("MOVE", "GF@f", "int@0")
+
+	program.add("LABEL", "loop")
+	program.add("ADD", "GF@i", "GF@i", "int@1")
+	program.add("JUMPIFNEQ", "loop", "GF@i", "int@{}".format(iterations))
+
+	return program.write()
+
+
+def measure(size: int, iterations: int) -> float:
+	"""Measures the shortest run time of a program out of several repeats
+
+	Arguments:
+		size {int} -- number of filler instructions
+		iterations {int} -- number of loop iterations
+
+	Returns:
+		float -- run time in seconds
+	"""
+
+	source = build_program(size, iterations)
+	times = list()
+
+	try:
+		for _ in range(REPEAT):
+			gc.disable()
+			try:
+				start = perf_counter()
+				Interpreter(source).run()
+				times.append(perf_counter() - start)
+			finally:
+				gc.enable()
+	finally:
+		remove(source)
+
+	return min(times)
+
+
+def main():
+	print("{:>10} {:>10} {:>14}".format("size", "iterations", "us per iter"))
+
+	for size in PROGRAM_SIZES:
+		# Subtracting a single iteration run removes parsing and filler cost,
+		# both times are minimums of several runs, so noise does not make
+		# the difference negative
+		base_time = measure(size, 1)
+		loop_time = measure(size, ITERATIONS + 1)
+		jump_cost = (loop_time - base_time) / ITERATIONS
+
+		print("{:>10} {:>10} {:>14.3f}".format(size, ITERATIONS, jump_cost * 1e6))
+
+
+if __name__ == '__main__':
+	main()
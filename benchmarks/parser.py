@@ -0,0 +1,133 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		parser.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Parser micro-benchmark over programs with long string literals
+#
+#	Usage: python -m benchmarks.parser
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import re
+
+from os import remove
+from time import perf_counter
+
+from benchmarks.program import ProgramBuilder
+from src.parser import Parser
+from src.strings import String
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+INSTRUCTION_COUNT = 2000
+LITERAL_LENGTHS = (16, 256, 4096)
+
+# String literal validation used by the parser before it was replaced
+# by src.strings.String.decode, kept as the reference for comparison
+LEGACY_STRING_REGEX = re.compile(
+	r"^(?!.*\\[^\d])(?!\\[\d]{1}[^\d])(?!\\[\d]{2}[^\d])(?:\w|[ -~]|\d)*"
+	r"(?<!(\\\d{0}))(?<!(\\\d{1}))(?<!(\\\d{2}))(?<!(\\))(?<!\s)$"
+)
+LEGACY_ESCAPE_REGEX = re.compile(r"\\\d{3}")
+
+
+def legacy_decode_string(text: str) -> str:
+	"""Validates and decodes a literal the way the parser used to
+
+	Arguments:
+		text {str} -- string literal
+
+	Returns:
+		str -- decoded string, None if the literal is invalid
+	"""
+
+	if not LEGACY_STRING_REGEX.match(text):
+		return None
+
+	for match in LEGACY_ESCAPE_REGEX.findall(text):
+		text = LEGACY_ESCAPE_REGEX.sub(chr(int(match[2:])), text)
+
+	return text
+
+
+def build_literal(length: int) -> str:
+	"""Builds a string literal with an escape sequence every 8 characters
+
+	Arguments:
+		length {int} -- approximate literal length
+
+	Returns:
+		str -- string literal
+	"""
+
+	return ("abc\\032def" * (length // 10 + 1))[:length].rstrip("\\0123456789 ") + "x"
+
+
+def measure_parser(literal: str) -> float:
+	"""Measures time of parsing a program full of a given literal
+
+	Arguments:
+		literal {str} -- string literal
+
+	Returns:
+		float -- parsing time in seconds
+	"""
+
+	program = ProgramBuilder()
+	for _ in range(INSTRUCTION_COUNT):
+		program.add("WRITE", "string@" + literal)
+	source = program.write()
+
+	try:
+		start = perf_counter()
+		Parser(source).run()
+		return perf_counter() - start
+	finally:
+		remove(source)
+
+
+def measure_literal(function: object, literal: str) -> float:
+	"""Measures time of validating a literal by a given function
+
+	Arguments:
+		function {object} -- literal validation function
+		literal {str} -- string literal
+
+	Returns:
+		float -- time of all validations in seconds
+	"""
+
+	start = perf_counter()
+	for _ in range(INSTRUCTION_COUNT):
+		function(literal)
+	return perf_counter() - start
+
+
+def main():
+	print("{:>8} {:>12} {:>14} {:>14} {:>9}".format(
+		"length", "parse [ms]", "legacy [ms]", "literal [ms]", "speedup"
+	))
+
+	for length in LITERAL_LENGTHS:
+		literal = build_literal(length)
+		parse_time = measure_parser(literal)
+		legacy_time = measure_literal(legacy_decode_string, literal)
+		literal_time = measure_literal(String.decode, literal)
+
+		print("{:>8} {:>12.1f} {:>14.1f} {:>14.1f} {:>8.1f}x".format(
+			len(literal), parse_time * 1e3, legacy_time * 1e3,
+			literal_time * 1e3, legacy_time / literal_time
+		))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,133 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		profiler.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Check of profiled jump counts at every optimization level
+#
+#	Usage: python -m benchmarks.profiler
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import json
+
+from io import StringIO
+from os import close, remove
+from tempfile import mkstemp
+
+from benchmarks.program import ProgramBuilder
+from src.interpreter import Interpreter
+from src.optimizer import Optimizer
+from src.output import OutputWriter
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Level at which jumps are fused into superinstructions, but type
+# checks are still kept
+REFERENCE_LEVEL = 1
+ITERATIONS = 200
+
+
+def build_program() -> ProgramBuilder:
+	"""Builds a program with loops closed by every kind of fused jump
+
+	Types of all variables are known, so at higher levels the fused
+	jumps become unchecked variants.
+
+	Returns:
+		ProgramBuilder -- program
+	"""
+
+	program = ProgramBuilder()
+	program.add("DEFVAR", "GF@i")
+	program.add("DEFVAR", "GF@c")
+
+	# LT followed by JUMPIFEQ on its result
+	program.add("MOVE", "GF@i", "int@0")
+	program.add("LABEL", "lt_loop")
+	program.add("ADD", "GF@i", "GF@i", "int@1")
+	program.add("LT", "GF@c", "GF@i", "int@{}".format(ITERATIONS))
+	program.add("JUMPIFEQ", "lt_loop", "GF@c", "bool@true")
+
+	# ADD followed by JUMP
+	program.add("MOVE", "GF@i", "int@0")
+	program.add("LABEL", "add_loop")
+	program.add("JUMPIFEQ", "add_end", "GF@i", "int@{}".format(ITERATIONS))
+	program.add("ADD", "GF@i", "GF@i", "int@1")
+	program.add("JUMP", "add_loop")
+	program.add("LABEL", "add_end")
+
+	# Plain conditional jump
+	program.add("MOVE", "GF@i", "int@0")
+	program.add("LABEL", "neq_loop")
+	program.add("ADD", "GF@i", "GF@i", "int@1")
+	program.add("JUMPIFNEQ", "neq_loop", "GF@i", "int@{}".format(ITERATIONS))
+	program.add("WRITE", "GF@i")
+
+	return program
+
+
+def jump_counts(source: str, opt_level: int) -> dict:
+	"""Profiles a program and collects counts of its jumps
+
+	Arguments:
+		source {str} -- program file
+		opt_level {int} -- optimization level
+
+	Returns:
+		dict -- (taken, not taken) of jump instructions by order,
+				with their opcode
+	"""
+
+	handle, profile_file = mkstemp(suffix=".json")
+	close(handle)
+
+	try:
+		Interpreter(source, output=OutputWriter(StringIO()), opt_level=opt_level,
+					profile=profile_file).run()
+		with open(profile_file) as f:
+			profile = json.load(f)
+	finally:
+		remove(profile_file)
+
+	return {
+		stats["order"]: (stats["opcode"], stats["taken"], stats["not_taken"])
+		for stats in profile["instructions"] if "taken" in stats
+	}
+
+
+def main():
+	source = build_program().write()
+
+	try:
+		reference = jump_counts(source, REFERENCE_LEVEL)
+
+		print("{:>6} {:>8} {:<22} {:>8} {:>10}".format("level", "order", "opcode", "taken", "not taken"))
+		for opt_level in range(REFERENCE_LEVEL, Optimizer.MAX_LEVEL + 1):
+			counts = jump_counts(source, opt_level)
+
+			for order, (opcode, taken, not_taken) in sorted(counts.items()):
+				print("{:>6} {:>8} {:<22} {:>8} {:>10}".format(opt_level, order, opcode, taken, not_taken))
+
+			for order, (opcode, taken, not_taken) in counts.items():
+				if order in reference and reference[order][1:] != (taken, not_taken):
+					raise AssertionError("level {} counts {} of {} on instruction {}, level {} counts {}"
+										 .format(opt_level, (taken, not_taken), opcode, order,
+												 REFERENCE_LEVEL, reference[order][1:]))
+			if counts.keys() != reference.keys():
+				raise AssertionError("level {} profiles jumps {}, level {} profiles {}".format(
+					opt_level, sorted(counts), REFERENCE_LEVEL, sorted(reference)))
+	finally:
+		remove(source)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,118 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		program.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Builder of IPPcode18 XML programs used by the benchmarks
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from xml.sax.saxutils import escape
+from tempfile import NamedTemporaryFile
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class ProgramBuilder():
+	"""IPPcode18 program builder
+
+	Collects instructions and renders them into the XML representation
+	read by the interpreter. Arguments are written in the IPPcode18 form,
+	e.g. 'GF@x', 'int@1' or 'string@abc'; the first argument of a jump
+	instruction is a label and the second argument of READ a type.
+	"""
+
+	LABEL_OPCODES = ('LABEL', 'JUMP', 'JUMPIFEQ', 'JUMPIFNEQ', 'CALL')
+
+	def __init__(self):
+		self._instructions = list()
+
+	def add(self, opcode: str, *args):
+		"""Appends an instruction to the program
+
+		Arguments:
+			opcode {str} -- instruction opcode
+			args {str} -- instruction arguments in IPPcode18 form
+		"""
+
+		self._instructions.append((opcode, args))
+
+	def __len__(self):
+		return len(self._instructions)
+
+	def to_xml(self) -> str:
+		"""Renders the program into its XML representation
+
+		Returns:
+			str -- XML source
+		"""
+
+		lines = [
+			'<?xml version="1.0" encoding="UTF-8"?>',
+			'<program language="IPPcode18">'
+		]
+
+		for order, (opcode, args) in enumerate(self._instructions, 1):
+			lines.append('  <instruction order="{}" opcode="{}">'.format(order, opcode))
+			for index, arg in enumerate(args, 1):
+				arg_type, arg_value = self.__split_arg(opcode, index, arg)
+				lines.append('    <arg{0} type="{1}">{2}</arg{0}>'.format(
+					index, arg_type, escape(arg_value)
+				))
+			lines.append('  </instruction>')
+
+		lines.append('</program>')
+
+		return "\n".join(lines) + "\n"
+
+	def write(self, path: str = None) -> str:
+		"""Writes the program into a file
+
+		Arguments:
+			path {str} -- target file, a temporary file is created if omitted
+
+		Returns:
+			str -- path of the written file
+		"""
+
+		if path is None:
+			with NamedTemporaryFile("w", suffix=".xml", delete=False) as f:
+				f.write(self.to_xml())
+				return f.name
+
+		with open(path, "w") as f:
+			f.write(self.to_xml())
+
+		return path
+
+	def __split_arg(self, opcode: str, index: int, arg: str) -> tuple:
+		"""Splits an argument into its type and value
+
+		Arguments:
+			opcode {str} -- instruction opcode
+			index {int} -- argument index
+			arg {str} -- argument in IPPcode18 form
+
+		Returns:
+			tuple -- argument type and value
+		"""
+
+		if index == 1 and opcode in ProgramBuilder.LABEL_OPCODES:
+			return ("label", arg)
+		if index == 2 and opcode == "READ":
+			return ("type", arg)
+
+		prefix, value = arg.split("@", 1)
+		if prefix in ("GF", "LF", "TF"):
+			return ("var", arg)
+
+		return (prefix, value)
@@ -0,0 +1,245 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		recursion.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Benchmark of function calls and frame creation in deep recursion
+#
+#	Usage: python -m benchmarks.recursion
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import gc
+
+from io import StringIO
+from os import remove
+from time import perf_counter
+
+from benchmarks.program import ProgramBuilder
+from src.interpreter import Interpreter
+from src.output import OutputWriter
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+FIB_ARGUMENTS = (15, 18, 21)
+ACKERMANN_ARGUMENTS = ((2, 50), (2, 100), (3, 5))
+REPEAT = 3
+
+
+def fib_program(n: int) -> ProgramBuilder:
+	"""Builds a program computing n-th Fibonacci number by plain recursion
+
+	Every call creates its own local frame, the argument and the result
+	are passed on the data stack.
+
+	Arguments:
+		n {int} -- Fibonacci number index
+
+	Returns:
+		ProgramBuilder -- program
+	"""
+
+	program = ProgramBuilder()
+	program.add("DEFVAR", "GF@result")
+	program.add("PUSHS", "int@{}".format(n))
+	program.add("CALL", "fib")
+	program.add("POPS", "GF@result")
+	program.add("WRITE", "GF@result")
+	program.add("JUMP", "end")
+
+	program.add("LABEL", "fib")
+	program.add("CREATEFRAME")
+	program.add("PUSHFRAME")
+	program.add("DEFVAR", "LF@n")
+	program.add("POPS", "LF@n")
+	program.add("DEFVAR", "LF@a")
+	program.add("JUMPIFEQ", "fib_base", "LF@n", "int@0")
+	program.add("JUMPIFEQ", "fib_base", "LF@n", "int@1")
+	program.add("SUB", "LF@a", "LF@n", "int@1")
+	program.add("PUSHS", "LF@a")
+	program.add("CALL", "fib")
+	program.add("POPS", "LF@a")
+	program.add("SUB", "LF@n", "LF@n", "int@2")
+	program.add("PUSHS", "LF@n")
+	program.add("CALL", "fib")
+	program.add("POPS", "LF@n")
+	program.add("ADD", "LF@n", "LF@n", "LF@a")
+	program.add("LABEL", "fib_base")
+	program.add("PUSHS", "LF@n")
+	program.add("POPFRAME")
+	program.add("RETURN")
+
+	program.add("LABEL", "end")
+
+	return program
+
+
+def ackermann_program(m: int, n: int) -> ProgramBuilder:
+	"""Builds a program computing the Ackermann function A(m, n)
+
+	Recursion depth grows with the result, so the local frame stack gets
+	deep, unlike in the Fibonacci program.
+
+	Arguments:
+		m {int} -- first argument
+		n {int} -- second argument
+
+	Returns:
+		ProgramBuilder -- program
+	"""
+
+	program = ProgramBuilder()
+	program.add("DEFVAR", "GF@result")
+	program.add("PUSHS", "int@{}".format(m))
+	program.add("PUSHS", "int@{}".format(n))
+	program.add("CALL", "ack")
+	program.add("POPS", "GF@result")
+	program.add("WRITE", "GF@result")
+	program.add("JUMP", "end")
+
+	# Arguments are pushed in order m, n
+	program.add("LABEL", "ack")
+	program.add("CREATEFRAME")
+	program.add("PUSHFRAME")
+	program.add("DEFVAR", "LF@n")
+	program.add("POPS", "LF@n")
+	program.add("DEFVAR", "LF@m")
+	program.add("POPS", "LF@m")
+	program.add("JUMPIFNEQ", "ack_m", "LF@m", "int@0")
+	program.add("ADD", "LF@n", "LF@n", "int@1")
+	program.add("PUSHS", "LF@n")
+	program.add("POPFRAME")
+	program.add("RETURN")
+
+	# A(m, 0) = A(m - 1, 1)
+	program.add("LABEL", "ack_m")
+	program.add("SUB", "LF@m", "LF@m", "int@1")
+	program.add("PUSHS", "LF@m")
+	program.add("JUMPIFNEQ", "ack_mn", "LF@n", "int@0")
+	program.add("PUSHS", "int@1")
+	program.add("CALL", "ack")
+	program.add("POPFRAME")
+	program.add("RETURN")
+
+	# A(m, n) = A(m - 1, A(m, n - 1)), m - 1 is already on the stack
+	program.add("LABEL", "ack_mn")
+	program.add("ADD", "LF@m", "LF@m", "int@1")
+	program.add("PUSHS", "LF@m")
+	program.add("SUB", "LF@n", "LF@n", "int@1")
+	program.add("PUSHS", "LF@n")
+	program.add("CALL", "ack")
+	program.add("CALL", "ack")
+	program.add("POPFRAME")
+	program.add("RETURN")
+
+	program.add("LABEL", "end")
+
+	return program
+
+
+def fib_calls(n: int) -> tuple:
+	"""Computes result and number of calls of the recursive Fibonacci function
+
+	Arguments:
+		n {int} -- Fibonacci number index
+
+	Returns:
+		tuple -- (result, calls)
+	"""
+
+	a, b = 0, 1
+	for _ in range(n):
+		a, b = b, a + b
+
+	# Number of calls is 2 * fib(n + 1) - 1
+	return a, 2 * b - 1
+
+
+def ackermann_calls(m: int, n: int) -> tuple:
+	"""Computes result and number of calls of the Ackermann function
+
+	Arguments:
+		m {int} -- first argument
+		n {int} -- second argument
+
+	Returns:
+		tuple -- (result, calls)
+	"""
+
+	stack = [m]
+	calls = 0
+
+	while stack:
+		m = stack.pop()
+		calls += 1
+		if m == 0:
+			n += 1
+		elif n == 0:
+			stack.append(m - 1)
+			n = 1
+		else:
+			stack.append(m - 1)
+			stack.append(m)
+			n -= 1
+
+	return n, calls
+
+
+def measure(program: ProgramBuilder, expected: int) -> float:
+	"""Measures the shortest run time of a program and checks its result
+
+	Arguments:
+		program {ProgramBuilder} -- program writing a single number
+		expected {int} -- expected result
+
+	Returns:
+		float -- run time in seconds
+	"""
+
+	source = program.write()
+	times = list()
+
+	try:
+		for _ in range(REPEAT):
+			output = StringIO()
+			gc.disable()
+			try:
+				start = perf_counter()
+				Interpreter(source, output=OutputWriter(output)).run()
+				times.append(perf_counter() - start)
+			finally:
+				gc.enable()
+
+			if output.getvalue() != str(expected):
+				raise AssertionError("unexpected result {!r}, expected {}".format(
+					output.getvalue(), expected))
+	finally:
+		remove(source)
+
+	return min(times)
+
+
+def main():
+	print("{:<18} {:>10} {:>10} {:>12}".format("function", "calls", "time [s]", "calls/s"))
+
+	benchmarks = (
+		[("fib({})".format(n), fib_program(n), fib_calls(n)) for n in FIB_ARGUMENTS] +
+		[("ackermann({}, {})".format(m, n), ackermann_program(m, n), ackermann_calls(m, n))
+		 for m, n in ACKERMANN_ARGUMENTS]
+	)
+
+	for name, program, (result, calls) in benchmarks:
+		run_time = measure(program, result)
+		print("{:<18} {:>10} {:>10.3f} {:>12.0f}".format(name, calls, run_time, calls / run_time))
+
+
+if __name__ == '__main__':
+	main()
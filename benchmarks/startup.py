@@ -0,0 +1,137 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		startup.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Benchmark of interpreter startup and import cost
+#
+#	Usage: python -m benchmarks.startup
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import os
+import subprocess
+import sys
+
+from tempfile import mkdtemp
+from time import perf_counter
+
+from benchmarks.program import ProgramBuilder
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+INTERPRETER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+REPEAT = 20
+TOP_IMPORTS = 8
+
+
+def build_program(directory: str) -> str:
+	"""Builds a short program, typical for a job run many times
+
+	Arguments:
+		directory {str} -- target directory
+
+	Returns:
+		str -- path to the program file
+	"""
+
+	program = ProgramBuilder()
+	program.add("DEFVAR", "GF@x")
+	program.add("MOVE", "GF@x", "string@hello\\032world")
+	program.add("WRITE", "GF@x")
+
+	return program.write(os.path.join(directory, "program.xml"))
+
+
+def wall_time(command: list) -> float:
+	"""Measures the shortest wall time of a command
+
+	Arguments:
+		command {list} -- command and its arguments
+
+	Returns:
+		float -- wall time in seconds
+	"""
+
+	times = list()
+	for _ in range(REPEAT):
+		start = perf_counter()
+		subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+		times.append(perf_counter() - start)
+
+	return min(times)
+
+
+def import_times(command: list) -> list:
+	"""Collects cumulative import times of top level modules
+
+	Arguments:
+		command {list} -- python command and its arguments
+
+	Returns:
+		list -- (microseconds, module) of top level imports, slowest first
+	"""
+
+	process = subprocess.run(
+		[command[0], "-X", "importtime"] + command[1:],
+		stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True, check=True
+	)
+
+	imports = list()
+	for line in process.stderr.splitlines():
+		if not line.startswith("import time:"):
+			continue
+
+		_, cumulative, module = line[len("import time:"):].split("|")
+		# Nested imports are indented, they are included in their parent
+		if cumulative.strip().isdigit() and not module.startswith("  "):
+			imports.append((int(cumulative), module.strip()))
+
+	return sorted(imports, reverse=True)
+
+
+def main():
+	directory = mkdtemp()
+	source = build_program(directory)
+
+	try:
+		# Creates the cache file used by the precompiled run
+		subprocess.run([sys.executable, INTERPRETER, "--source=" + source, "--cache"],
+					   stdout=subprocess.DEVNULL, check=True)
+
+		scenarios = (
+			("python -c pass", [sys.executable, "-c", "pass"]),
+			("xml source", [sys.executable, INTERPRETER, "--source=" + source]),
+			("cached", [sys.executable, INTERPRETER, "--source=" + source, "--cache"]),
+			("precompiled", [sys.executable, INTERPRETER, "--source=" + source + ".ippc"]),
+		)
+
+		print("{:<16} {:>12} {:>12}".format("scenario", "wall [ms]", "imports [ms]"))
+		details = list()
+
+		for name, command in scenarios:
+			imports = import_times(command)
+			total = sum(time for time, _ in imports)
+			print("{:<16} {:>12.1f} {:>12.1f}".format(name, wall_time(command) * 1e3, total / 1e3))
+			details.append((name, imports))
+
+		for name, imports in details[1:]:
+			print("\nSlowest imports, {}:".format(name))
+			for time, module in imports[:TOP_IMPORTS]:
+				print("  {:>8.1f} ms  {}".format(time / 1e3, module))
+	finally:
+		for file in os.listdir(directory):
+			os.remove(os.path.join(directory, file))
+		os.rmdir(directory)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,411 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		suite.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Benchmark suite of representative IPPcode18 workloads
+#
+#	Usage: python -m benchmarks.suite [--save] [--baseline=<file>]
+#	                                  [--repeat=<n>] [--threshold=<ratio>]
+#	                                  [workload ...]
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import gc
+import json
+import os
+import platform
+import tracemalloc
+
+from argparse import ArgumentParser
+from io import StringIO
+from tempfile import NamedTemporaryFile
+from time import perf_counter
+
+from benchmarks.program import ProgramBuilder
+from src.interpreter import Interpreter
+from src.optimizer import Optimizer
+from src.parser import Parser
+from src.output import OutputWriter
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Workloads
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def counted_loop(program: ProgramBuilder, name: str, count: int, body):
+	"""Appends a loop executing its body a given number of times
+
+	Arguments:
+		program {ProgramBuilder} -- program to be extended
+		name {str} -- loop name, used for the counter and labels
+		count {int} -- number of iterations
+		body {callable} -- function adding the loop body to the program
+	"""
+
+	counter = "GF@{}_i".format(name)
+	condition = "GF@{}_c".format(name)
+
+	program.add("DEFVAR", counter)
+	program.add("DEFVAR", condition)
+	program.add("MOVE", counter, "int@0")
+	program.add("LABEL", name)
+	program.add("LT", condition, counter, "int@{}".format(count))
+	program.add("JUMPIFNEQ", name + "_end", condition, "bool@true")
+	body()
+	program.add("ADD", counter, counter, "int@1")
+	program.add("JUMP", name)
+	program.add("LABEL", name + "_end")
+
+
+def arithmetic_workload() -> ProgramBuilder:
+	"""Tight loop of integer arithmetic"""
+
+	program = ProgramBuilder()
+	program.add("DEFVAR", "GF@x")
+	program.add("MOVE", "GF@x", "int@1")
+
+	def body():
+		program.add("MUL", "GF@x", "GF@x", "int@3")
+		program.add("ADD", "GF@x", "GF@x", "GF@loop_i")
+		program.add("IDIV", "GF@x", "GF@x", "int@2")
+		program.add("SUB", "GF@x", "GF@x", "int@1")
+
+	counted_loop(program, "loop", 50000, body)
+	program.add("WRITE", "GF@x")
+
+	return program
+
+
+def recursion_workload() -> ProgramBuilder:
+	"""Recursive Fibonacci numbers, arguments and results are passed on the data stack"""
+
+	program = ProgramBuilder()
+	program.add("DEFVAR", "GF@result")
+	program.add("PUSHS", "int@20")
+	program.add("CALL", "fib")
+	program.add("POPS", "GF@result")
+	program.add("WRITE", "GF@result")
+	program.add("JUMP", "end")
+
+	program.add("LABEL", "fib")
+	program.add("CREATEFRAME")
+	program.add("PUSHFRAME")
+	program.add("DEFVAR", "LF@n")
+	program.add("POPS", "LF@n")
+	program.add("DEFVAR", "LF@c")
+	program.add("LT", "LF@c", "LF@n", "int@2")
+	program.add("JUMPIFEQ", "fib_base", "LF@c", "bool@true")
+	program.add("DEFVAR", "LF@a")
+	program.add("SUB", "LF@a", "LF@n", "int@1")
+	program.add("PUSHS", "LF@a")
+	program.add("CALL", "fib")
+	program.add("POPS", "LF@a")
+	program.add("SUB", "LF@n", "LF@n", "int@2")
+	program.add("PUSHS", "LF@n")
+	program.add("CALL", "fib")
+	program.add("POPS", "LF@n")
+	program.add("ADD", "LF@n", "LF@n", "LF@a")
+	program.add("LABEL", "fib_base")
+	program.add("PUSHS", "LF@n")
+	program.add("POPFRAME")
+	program.add("RETURN")
+
+	program.add("LABEL", "end")
+
+	return program
+
+
+def strings_workload() -> ProgramBuilder:
+	"""String building with CONCAT and SETCHAR"""
+
+	program = ProgramBuilder()
+	program.add("DEFVAR", "GF@s")
+	program.add("DEFVAR", "GF@c")
+	program.add("DEFVAR", "GF@len")
+	program.add("MOVE", "GF@s", "string@")
+
+	def body():
+		program.add("CONCAT", "GF@s", "GF@s", "string@ab\\032")
+		program.add("STRLEN", "GF@len", "GF@s")
+		program.add("SUB", "GF@len", "GF@len", "int@1")
+		program.add("SETCHAR", "GF@s", "GF@len", "string@x")
+		program.add("GETCHAR", "GF@c", "GF@s", "int@0")
+
+	counted_loop(program, "loop", 5000, body)
+	program.add("WRITE", "GF@len")
+
+	return program
+
+
+def stack_workload() -> ProgramBuilder:
+	"""Data stack heavy loop"""
+
+	program = ProgramBuilder()
+	program.add("DEFVAR", "GF@a")
+	program.add("DEFVAR", "GF@b")
+	program.add("MOVE", "GF@a", "int@0")
+
+	def body():
+		program.add("PUSHS", "GF@a")
+		program.add("PUSHS", "GF@loop_i")
+		program.add("PUSHS", "int@1")
+		program.add("POPS", "GF@b")
+		program.add("POPS", "GF@a")
+		program.add("ADD", "GF@a", "GF@a", "GF@b")
+		program.add("PUSHS", "GF@a")
+		program.add("POPS", "GF@a")
+		program.add("POPS", "GF@b")
+
+	counted_loop(program, "loop", 50000, body)
+	program.add("WRITE", "GF@a")
+
+	return program
+
+
+def parse_workload() -> ProgramBuilder:
+	"""Large straight-line program, dominated by parsing"""
+
+	program = ProgramBuilder()
+	program.add("DEFVAR", "GF@i")
+	program.add("DEFVAR", "GF@s")
+	program.add("DEFVAR", "GF@b")
+
+	for i in range(30000):
+		program.add("MOVE", "GF@i", "int@{}".format(i))
+		program.add("MOVE", "GF@s", "string@line\\032{}\\010text".format(i))
+		program.add("MOVE", "GF@b", "bool@true")
+
+	return program
+
+
+def write_workload() -> ProgramBuilder:
+	"""Output heavy loop"""
+
+	program = ProgramBuilder()
+
+	def body():
+		program.add("WRITE", "GF@loop_i")
+		program.add("WRITE", "string@\\032value\\010")
+		program.add("WRITE", "bool@false")
+
+	counted_loop(program, "loop", 50000, body)
+
+	return program
+
+
+WORKLOADS = {
+	"arithmetic": arithmetic_workload,
+	"recursion": recursion_workload,
+	"strings": strings_workload,
+	"stack": stack_workload,
+	"parse": parse_workload,
+	"write": write_workload,
+}
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Measurement
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.2
+
+# Metric name, unit scale, unit, True if higher values are better,
+# smallest baseline value compared (shorter times are mostly noise)
+METRICS = (
+	("instructions_per_second", 1e-6, "M instr/s", True, 0),
+	("parse_time", 1e3, "ms parse", False, 0.01),
+	("run_time", 1e3, "ms run", False, 0.01),
+	("peak_memory", 1 / 2 ** 20, "MiB peak", False, 0),
+)
+
+
+def run_interpreter(source: str, **options):
+	"""Runs a program with output discarded
+
+	Arguments:
+		source {str} -- program file
+		options {dict} -- additional Interpreter arguments
+	"""
+
+	Interpreter(source, output=OutputWriter(StringIO()), **options).run()
+
+
+def count_instructions(source: str) -> int:
+	"""Counts instructions executed by a program without optimizations
+
+	Arguments:
+		source {str} -- program file
+
+	Returns:
+		int -- number of executed instructions
+	"""
+
+	with NamedTemporaryFile(suffix=".json", delete=False) as f:
+		profile_file = f.name
+
+	try:
+		run_interpreter(source, opt_level=0, profile=profile_file)
+		with open(profile_file) as f:
+			return json.load(f)["instructions_executed"]
+	finally:
+		os.remove(profile_file)
+
+
+def best_time(function, repeat: int) -> float:
+	"""Measures the shortest run time of a function
+
+	Arguments:
+		function {callable} -- measured function
+		repeat {int} -- number of measurements
+
+	Returns:
+		float -- run time in seconds
+	"""
+
+	times = list()
+	gc.disable()
+	try:
+		for _ in range(repeat):
+			start = perf_counter()
+			function()
+			times.append(perf_counter() - start)
+	finally:
+		gc.enable()
+
+	return min(times)
+
+
+def measure(source: str, repeat: int, opt_level: int) -> dict:
+	"""Measures a workload
+
+	Instructions per second are computed from the number of instructions
+	of the original program, so optimizations show up as a higher rate.
+
+	Arguments:
+		source {str} -- program file
+		repeat {int} -- number of measurements
+		opt_level {int} -- optimization level of the interpreter
+
+	Returns:
+		dict -- metrics
+	"""
+
+	instructions = count_instructions(source)
+	parse_time = best_time(lambda: Parser(source).run(), repeat)
+	run_time = best_time(lambda: run_interpreter(source, opt_level=opt_level), repeat)
+
+	tracemalloc.start()
+	try:
+		run_interpreter(source, opt_level=opt_level)
+		peak_memory = tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+
+	return {
+		"instructions": instructions,
+		"instructions_per_second": instructions / run_time,
+		"parse_time": parse_time,
+		"run_time": run_time,
+		"peak_memory": peak_memory
+	}
+
+
+def compare(name: str, result: dict, baseline: dict, threshold: float) -> list:
+	"""Compares workload metrics with the baseline
+
+	Arguments:
+		name {str} -- workload name
+		result {dict} -- measured metrics
+		baseline {dict} -- baseline metrics of the workload
+		threshold {float} -- allowed relative slowdown
+
+	Returns:
+		list -- descriptions of regressed metrics
+	"""
+
+	regressions = list()
+
+	for metric, _, unit, higher_is_better, minimum in METRICS:
+		if not baseline.get(metric) or baseline[metric] < minimum:
+			continue
+
+		change = result[metric] / baseline[metric] - 1
+		if higher_is_better:
+			change = -change
+
+		if change > threshold:
+			regressions.append("{}: {} worse by {:.1f}%".format(name, unit, 100 * change))
+
+	return regressions
+
+
+def main():
+	parser = ArgumentParser(description="IPPcode18 interpreter benchmark suite")
+	parser.add_argument("workloads", nargs="*",
+						help="workloads to run: {} (default all)".format(", ".join(WORKLOADS)))
+	parser.add_argument("--baseline", default=BASELINE_FILE,
+						help="baseline file (default benchmarks/baseline.json)")
+	parser.add_argument("--save", action="store_true",
+						help="store results as the new baseline")
+	parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+						help="measurements per workload, the best one is used")
+	parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+						help="relative change reported as a regression (default 0.2)")
+	parser.add_argument("-O", "--opt-level", type=int, default=Optimizer.DEFAULT_LEVEL,
+						help="optimization level, compare only with a baseline of the same level")
+	args = parser.parse_args()
+
+	for name in args.workloads:
+		if name not in WORKLOADS:
+			parser.error("unknown workload '{}'".format(name))
+
+	baseline = dict()
+	if not args.save and os.path.exists(args.baseline):
+		with open(args.baseline) as f:
+			baseline = json.load(f)["workloads"]
+
+	results = dict()
+	regressions = list()
+
+	print("{:<12} {:>12}".format("workload", "instructions") + "".join(
+		" {:>12}".format(unit) for _, _, unit, _, _ in METRICS))
+
+	for name in args.workloads or WORKLOADS:
+		source = WORKLOADS[name]().write()
+		try:
+			results[name] = measure(source, args.repeat, args.opt_level)
+		finally:
+			os.remove(source)
+
+		print("{:<12} {:>12}".format(name, results[name]["instructions"]) + "".join(
+			" {:>12.3f}".format(results[name][metric] * scale)
+			for metric, scale, _, _, _ in METRICS))
+
+		if name in baseline:
+			regressions += compare(name, results[name], baseline[name], args.threshold)
+
+	if args.save:
+		with open(args.baseline, "w") as f:
+			json.dump({"python": platform.python_version(), "workloads": results}, f, indent=2)
+		print("Baseline stored into", args.baseline)
+		return 0
+
+	if not baseline:
+		print("No baseline to compare with, use --save to store one")
+		return 0
+
+	for regression in regressions:
+		print("REGRESSION", regression)
+
+	return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+	exit(main())
@@ -15,17 +15,33 @@
 #	Imports
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-from sys import stderr
+from sys import argv, stderr
 
 from src.interpreter import Interpreter
+from src.cache import ProgramCache
 from src.exceptions import InterpreterError
-from src.arguments import Arguments
 from src.debug import Debug
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #	Main
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+def precompiled_source():
+	"""Returns precompiled program file if it is the only argument
+
+	Such runs take a fast path which does not even import the argument
+	parser.
+
+	Returns:
+		str -- precompiled program file, None if there are other arguments
+	"""
+
+	if len(argv) == 2 and argv[1].startswith("--source=") and argv[1].endswith(ProgramCache.SUFFIX):
+		return argv[1][len("--source="):]
+
+	return None
+
+
 def main():
 	"""Main function
 	
@@ -34,8 +50,39 @@ def main():
 	"""
 	
 	try:
+		source = precompiled_source()
+		if source is not None:
+			Interpreter(source).run()
+			return 0
+
+		from src.arguments import Arguments
 		Args = Arguments()	
-		Interpreter(Args.get_source_file()).run()
+
+		if Args.get_server_socket() is not None:
+			from src.server import Server
+			Server(
+				Args.get_server_socket(),
+				opt_level=Args.get_opt_level(),
+				max_instructions=Args.get_max_instructions(),
+				timeout=Args.get_timeout()
+			).run()
+			return 0
+
+		with Args.get_input_reader() as input_reader:
+			Interpreter(
+				Args.get_source_file(),
+				streaming=Args.get_streaming(),
+				cache_dir=Args.get_cache_dir(),
+				output=Args.get_output_writer(),
+				input_reader=input_reader,
+				opt_level=Args.get_opt_level(),
+				profile=Args.get_profile(),
+				checkpoint_file=Args.get_checkpoint_file(),
+				checkpoint_interval=Args.get_checkpoint_interval(),
+				resume_file=Args.get_resume_file(),
+				max_instructions=Args.get_max_instructions(),
+				timeout=Args.get_timeout()
+			).run()
 	except InterpreterError as e:
 		print("[ ERROR ]", e, file=stderr)
 		return e.code
@@ -18,8 +18,11 @@
 from sys import argv
 from argparse import ArgumentParser
 
-from src.exceptions import InterpreterError, ArgumentsError
+from src.exceptions import InterpreterError, ArgumentsError, InputFileError
 from src.debug import Debug
+from src.output import OutputWriter
+from src.input import InputReader
+from src.optimizer import Optimizer
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #	Code
@@ -34,11 +37,49 @@ class Arguments:
 
 	helpMessage = (
 		"-----------------------------------------------------------------------------------\n"
-		"Usage: interpret.py --source=<file>\n"
+		"Usage: interpret.py --source=<file> [options]\n"
+		"       interpret.py --server[=<socket>] [--opt-level=<n>] [--max-instructions=<n>]\n"
+		"                    [--timeout=<seconds>]\n"
 		"-----------------------------------------------------------------------------------\n"
 		"Program reads XML representation of a program from a given file and which\n"
 		"it then interprets using standard intput and output. Input XML representation\n"
 		"is generated may be generated by script 'parse.php' from an IPPcode18 source code.\n"
+		"-----------------------------------------------------------------------------------\n"
+		"  --stream         parse the source incrementally, lowers memory usage\n"
+		"                   for very large programs\n"
+		"  --cache[=<dir>]  cache parsed program next to the source file or in a given\n"
+		"                   directory, unchanged sources are not parsed again\n"
+		"  --debug[=<categories>]\n"
+		"                   print debug messages of given comma separated categories:\n"
+		"                   general, parser, frames, dispatch, cache, jit (default all)\n"
+		"  --input=<file>   read input of READ instructions from a file instead of stdin\n"
+		"  --output-buffer=<size>\n"
+		"                   size of the output buffer in characters (default 65536)\n"
+		"  --unbuffered     write output immediately, for interactive use\n"
+		"  --profile[=<file>]\n"
+		"                   count executions and time of instructions and jumps,\n"
+		"                   print the report or write it as JSON into a given file\n"
+		"  --checkpoint=<file>\n"
+		"                   write snapshots of the interpreter state into a file\n"
+		"                   on signal SIGUSR1 and every --checkpoint-interval\n"
+		"  --checkpoint-interval=<n>\n"
+		"                   write a checkpoint every n instructions (default 0, only\n"
+		"                   on signal)\n"
+		"  --max-instructions=<n>\n"
+		"                   stop the program after n executed instructions\n"
+		"  --timeout=<seconds>\n"
+		"                   stop the program running longer than given seconds\n"
+		"                   (limits also apply to every job of a server)\n"
+		"  --resume=<file>  continue from a checkpoint of the same program run at the\n"
+		"                   same optimization level, given input is read from the line\n"
+		"                   following the last one read before the checkpoint\n"
+		"  --server[=<socket>]\n"
+		"                   run as a server executing JSON jobs read line by line\n"
+		"                   from stdin or from connections to a given Unix socket\n"
+		"  --opt-level=<n>  optimization level: 0 none, 1 fuse frequent instruction\n"
+		"                   pairs into superinstructions (default), 2 also fold\n"
+		"                   constants, remove unreachable code and unused labels and\n"
+		"                   skip proven type checks, 3 also compile hot loops\n"
 		"-----------------------------------------------------------------------------------"
 	)
 
@@ -55,7 +96,20 @@ class Arguments:
 		parser = ArgumentParser(add_help=False)
 		parser.add_argument('-f', '--source', type=str, default="")
 		parser.add_argument('-h', '--help', action='store_true')
-		parser.add_argument('-d', '--debug', action='store_true', default=False)
+		parser.add_argument('-d', '--debug', type=str, nargs='?', const="all", default=None)
+		parser.add_argument('-s', '--stream', action='store_true', default=False)
+		parser.add_argument('-c', '--cache', type=str, nargs='?', const="", default=None)
+		parser.add_argument('-i', '--input', type=str, default="")
+		parser.add_argument('--output-buffer', type=int, default=OutputWriter.DEFAULT_BUFFER_SIZE)
+		parser.add_argument('-u', '--unbuffered', action='store_true', default=False)
+		parser.add_argument('-O', '--opt-level', type=int, default=Optimizer.DEFAULT_LEVEL)
+		parser.add_argument('-p', '--profile', type=str, nargs='?', const="", default=None)
+		parser.add_argument('--server', type=str, nargs='?', const="", default=None)
+		parser.add_argument('--checkpoint', type=str, default=None)
+		parser.add_argument('--checkpoint-interval', type=int, default=0)
+		parser.add_argument('--resume', type=str, default=None)
+		parser.add_argument('--max-instructions', type=int, default=None)
+		parser.add_argument('--timeout', type=float, default=None)
 
 		try:
 			self.args = vars(parser.parse_args())
@@ -74,11 +128,111 @@ class Arguments:
 			print(Arguments.helpMessage)
 			exit(0)
 		
-		if self.args['source'] == "":
+		if self.args['server'] is not None:
+			if self.args['source'] != "":
+				raise ArgumentsError("server jobs specify their own source files")
+		elif self.args['source'] == "":
 			raise ArgumentsError("source file is required")
 
-		if self.args['debug']:
-			Debug.active(True)
+		if self.args['checkpoint_interval'] < 0:
+			raise ArgumentsError("checkpoint interval can not be negative")
+
+		if self.args['checkpoint_interval'] and self.args['checkpoint'] is None:
+			raise ArgumentsError("checkpoint interval requires a checkpoint file")
+
+		if self.args['checkpoint'] is not None and self.args['profile'] is not None:
+			raise ArgumentsError("checkpoints can not be combined with profiling")
+
+		if self.args['max_instructions'] is not None and self.args['max_instructions'] < 1:
+			raise ArgumentsError("instruction limit has to be positive")
+
+		if self.args['timeout'] is not None and not self.args['timeout'] > 0:
+			raise ArgumentsError("timeout has to be positive")
+
+		if self.args['profile'] is not None and (
+				self.args['max_instructions'] is not None or self.args['timeout'] is not None):
+			raise ArgumentsError("execution limits can not be combined with profiling")
+
+		if self.args['server'] is not None and (
+				self.args['checkpoint'] is not None or self.args['resume'] is not None):
+			raise ArgumentsError("server jobs can not be checkpointed")
+
+		if self.args['output_buffer'] < 0:
+			raise ArgumentsError("output buffer size can not be negative")
+
+		if not 0 <= self.args['opt_level'] <= Optimizer.MAX_LEVEL:
+			raise ArgumentsError("optimization level has to be 0 to {}".format(Optimizer.MAX_LEVEL))
+
+		if self.args['debug'] is not None:
+			Debug.active(True, self.__debug_categories(self.args['debug']))
+
+	def __debug_categories(self, value: str) -> tuple:
+		"""Parses list of debug categories
+
+		Arguments:
+			value {str} -- comma separated categories or 'all'
+
+		Raises:
+			ArgumentsError -- unknown category
+
+		Returns:
+			tuple -- debug categories
+		"""
+
+		if value == "all":
+			return Debug.CATEGORIES
+
+		categories = tuple(category.strip() for category in value.split(","))
+		for category in categories:
+			if category not in Debug.CATEGORIES:
+				raise ArgumentsError("unknown debug category '{}'".format(category))
+
+		return categories
 
 	def get_source_file(self):
 		return self.args['source']
+
+	def get_streaming(self):
+		return self.args['stream']
+
+	def get_cache_dir(self):
+		return self.args['cache']
+
+	def get_opt_level(self):
+		return self.args['opt_level']
+
+	def get_profile(self):
+		return self.args['profile']
+
+	def get_checkpoint_file(self):
+		return self.args['checkpoint']
+
+	def get_checkpoint_interval(self):
+		return self.args['checkpoint_interval']
+
+	def get_resume_file(self):
+		return self.args['resume']
+
+	def get_max_instructions(self):
+		return self.args['max_instructions']
+
+	def get_timeout(self):
+		return self.args['timeout']
+
+	def get_server_socket(self):
+		return self.args['server']
+
+	def get_input_reader(self):
+		if self.args['input'] == "":
+			return InputReader()
+
+		try:
+			return InputReader(open(self.args['input']))
+		except OSError:
+			raise InputFileError("input '{}' not found".format(self.args['input']))
+
+	def get_output_writer(self):
+		return OutputWriter(
+			buffer_size=self.args['output_buffer'],
+			buffered=not self.args['unbuffered']
+		)
@@ -0,0 +1,202 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		batch.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Parallel runner of program jobs listed in a manifest
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import json
+import os
+
+from multiprocessing import Pool
+from sys import stderr
+from time import perf_counter
+
+from src.server import Server
+from src.optimizer import Optimizer
+from src.exceptions import *
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Exit code names, e.g. 57 -> 'DIVISION_ZERO'
+EXIT_CODE_NAMES = {
+	code: name for name, code in vars(ExitCode).items() if isinstance(code, int)
+}
+EXIT_CODE_NAMES[0] = "OK"
+
+# Job runner of a worker process, its parsed program cache is kept
+# between jobs, so every distinct source is parsed once per worker
+_worker_server = None
+
+
+def _init_worker(opt_level: int, max_instructions: int, timeout: float):
+	global _worker_server
+	_worker_server = Server(opt_level=opt_level, max_instructions=max_instructions,
+							timeout=timeout)
+
+
+def _run_job(job: dict) -> dict:
+	"""Runs a manifest job in a worker process
+
+	Arguments:
+		job {dict} -- manifest job
+
+	Returns:
+		dict -- job result
+	"""
+
+	start = perf_counter()
+
+	try:
+		program_input = _read_file(job["input"]) if "input" in job else ""
+		expected = _read_file(job["expected"]) if "expected" in job else None
+	except InputFileError as e:
+		result = {"id": job["id"], "output": "", "code": e.code, "error": str(e)}
+		expected = None
+	else:
+		result = _worker_server.run_job({
+			"id": job["id"], "source": job["source"], "input": program_input
+		})
+
+	passed = None
+	if expected is not None or "code" in job:
+		passed = (
+			(expected is None or result["output"] == expected)
+			and result["code"] == job.get("code", result["code"])
+		)
+
+	return {
+		"id": result["id"],
+		"source": job["source"],
+		"code": result["code"],
+		"status": EXIT_CODE_NAMES.get(result["code"], "UNKNOWN"),
+		"error": result["error"],
+		"passed": passed,
+		"time": round(perf_counter() - start, 6),
+		"worker": os.getpid()
+	}
+
+
+def _read_file(path: str) -> str:
+	"""Reads a job file
+
+	Arguments:
+		path {str} -- file path
+
+	Raises:
+		InputFileError -- file can not be read
+
+	Returns:
+		str -- file content
+	"""
+
+	try:
+		with open(path) as f:
+			return f.read()
+	except OSError:
+		raise InputFileError("'{}' not found".format(path))
+
+
+class BatchRunner():
+	"""Batch runner
+
+	Runs jobs of a manifest in a pool of worker processes and writes their
+	results as JSON lines in the order they finish. Manifest is a file
+	with one JSON job per line:
+
+		{"source": "<file>", "input": "<file>", "expected": "<file>",
+		 "code": <expected exit code>, "id": any}
+
+	Only the source is required, relative paths are relative to the
+	manifest. A job passes if its output and exit code match the expected
+	ones; jobs without any expectation are only run. Execution limits
+	apply to every job, a job exceeding them fails with the LIMIT_EXCEEDED
+	status and its worker goes on with the next job.
+	"""
+
+	def __init__(self, manifest_file: str, processes: int = None,
+				 opt_level: int = Optimizer.DEFAULT_LEVEL, max_instructions: int = None,
+				 timeout: float = None):
+		self._manifest_file = manifest_file
+		self._processes = processes or os.cpu_count()
+		self._opt_level = opt_level
+		self._max_instructions = max_instructions
+		self._timeout = timeout
+
+	def run(self, results: object) -> bool:
+		"""Runs all jobs of the manifest
+
+		Arguments:
+			results {object} -- text stream for JSON results
+
+		Returns:
+			bool -- True if all jobs succeeded and passed
+		"""
+
+		jobs = self.__load_manifest()
+		succeeded = 0
+		failed = 0
+		start = perf_counter()
+
+		worker_args = (self._opt_level, self._max_instructions, self._timeout)
+		with Pool(self._processes, _init_worker, worker_args) as pool:
+			for result in pool.imap_unordered(_run_job, jobs):
+				results.write(json.dumps(result) + "\n")
+				results.flush()
+
+				if result["passed"] is False or (result["passed"] is None and result["code"]):
+					failed += 1
+				else:
+					succeeded += 1
+
+		print("Batch: {} jobs, {} succeeded, {} failed in {:.3f} s on {} processes".format(
+			len(jobs), succeeded, failed, perf_counter() - start, self._processes), file=stderr)
+
+		return failed == 0
+
+	def __load_manifest(self) -> list:
+		"""Loads jobs from the manifest
+
+		Raises:
+			InputFileError -- manifest can not be read
+			ArgumentsError -- invalid job
+
+		Returns:
+			list -- jobs with resolved paths
+		"""
+
+		base_dir = os.path.dirname(self._manifest_file)
+		jobs = list()
+
+		for number, line in enumerate(_read_file(self._manifest_file).splitlines(), 1):
+			if not line.strip():
+				continue
+
+			try:
+				job = json.loads(line)
+			except ValueError:
+				raise ArgumentsError("manifest line {} is not a valid JSON".format(number))
+
+			if not isinstance(job, dict) or "source" not in job:
+				raise ArgumentsError("manifest line {} has no source".format(number))
+
+			for key in ("source", "input", "expected"):
+				if key in job:
+					job[key] = os.path.join(base_dir, job[key])
+			job.setdefault("id", number)
+
+			jobs.append(job)
+
+		return jobs
@@ -0,0 +1,258 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		cache.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Caches of parsed programs keyed by the source hash
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import marshal
+import os
+
+from collections import OrderedDict
+from sys import version_info
+
+from src.exceptions import InputFileError
+from src.debug import Debug
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class ProgramCache():
+	"""Parsed program cache
+
+	Stores the validated instruction list and jump label list of a program
+	in a binary file, so later runs of an unchanged source skip XML parsing
+	and validation. The cache file is placed next to the source file, or
+	named after the source hash inside a given cache directory.
+
+	File layout: magic, format version, Python version, SHA-256 digest of
+	the source and a marshalled (instruction_list, jump_label_list) tuple.
+	A cache entry is used only if the stored digest matches the current
+	source content. A cache file may be also run directly as a precompiled
+	program, without its source.
+
+	hashlib is imported only when a digest is computed, running
+	a precompiled program does not need it.
+	"""
+
+	MAGIC = b"IPPC"
+	VERSION = 1
+	SUFFIX = ".ippc"
+
+	HEADER = MAGIC + bytes((VERSION, version_info[0], version_info[1]))
+	DIGEST_SIZE = 32
+
+	def __init__(self, source_file: str, cache_dir: str = ""):
+		self._source_file = source_file
+		self._cache_dir = cache_dir
+		self._digest = None
+
+	def load(self) -> tuple:
+		"""Loads cached program of the source file
+
+		Returns:
+			tuple -- instruction list and jump label list, None if there is
+					 no valid cache entry
+		"""
+
+		try:
+			self._digest = self.__source_digest()
+			with open(self.__cache_file(), "rb") as f:
+				data = f.read()
+		except OSError:
+			return None
+
+		header_len = len(ProgramCache.HEADER)
+		if data[header_len:header_len + ProgramCache.DIGEST_SIZE] != self._digest:
+			return None
+
+		program = ProgramCache.__unpack(data)
+		if program is not None:
+			Debug.printd("Cache -> HIT", self.__cache_file(), category=Debug.CACHE)
+
+		return program
+
+	@staticmethod
+	def read(cache_file: str) -> tuple:
+		"""Loads a precompiled program from a cache file
+
+		The program is not checked against its source, the source file
+		is not needed at all.
+
+		Arguments:
+			cache_file {str} -- cache file
+
+		Raises:
+			InputFileError -- file not found or not a valid cache file
+
+		Returns:
+			tuple -- instruction list and jump label list
+		"""
+
+		try:
+			with open(cache_file, "rb") as f:
+				data = f.read()
+		except OSError:
+			raise InputFileError("not found")
+
+		program = ProgramCache.__unpack(data)
+		if program is None:
+			raise InputFileError("'{}' is not a valid precompiled program".format(cache_file))
+
+		return program
+
+	@staticmethod
+	def __unpack(data: bytes) -> tuple:
+		"""Extracts program from cache file content
+
+		Arguments:
+			data {bytes} -- cache file content
+
+		Returns:
+			tuple -- instruction list and jump label list, None if the content
+					 is not valid
+		"""
+
+		if data[:len(ProgramCache.HEADER)] != ProgramCache.HEADER:
+			return None
+
+		try:
+			instruction_list, jump_label_list = marshal.loads(
+				data[len(ProgramCache.HEADER) + ProgramCache.DIGEST_SIZE:]
+			)
+		except (EOFError, ValueError, TypeError):
+			return None
+
+		return (instruction_list, jump_label_list)
+
+	def store(self, instruction_list: dict, jump_label_list: dict):
+		"""Stores parsed program of the source file
+
+		Failure to write the cache is not an error, the program
+		is simply parsed again next time.
+
+		Arguments:
+			instruction_list {dict} -- parsed instructions
+			jump_label_list {dict} -- jump labels
+		"""
+
+		try:
+			if self._digest is None:
+				self._digest = self.__source_digest()
+
+			if self._cache_dir:
+				os.makedirs(self._cache_dir, exist_ok=True)
+
+			cache_file = self.__cache_file()
+			tmp_file = "{}.{}.tmp".format(cache_file, os.getpid())
+
+			with open(tmp_file, "wb") as f:
+				f.write(ProgramCache.HEADER)
+				f.write(self._digest)
+				marshal.dump((instruction_list, jump_label_list), f)
+
+			# Atomic replace, concurrent runs never read a partial file
+			os.replace(tmp_file, cache_file)
+		except OSError as e:
+			Debug.printd("Cache -> unable to store", e, category=Debug.CACHE)
+			return
+
+		Debug.printd("Cache -> STORED", cache_file, category=Debug.CACHE)
+
+	def __source_digest(self) -> bytes:
+		"""Computes hash of the source file content
+
+		Returns:
+			bytes -- SHA-256 digest
+		"""
+
+		from hashlib import sha256
+
+		with open(self._source_file, "rb") as f:
+			return sha256(f.read()).digest()
+
+	def __cache_file(self) -> str:
+		"""Returns path of the cache file
+
+		Returns:
+			str -- cache file path
+		"""
+
+		if self._cache_dir:
+			return os.path.join(self._cache_dir, self._digest.hex() + ProgramCache.SUFFIX)
+
+		return self._source_file + ProgramCache.SUFFIX
+
+
+class ProgramLRUCache():
+	"""In-memory cache of parsed programs
+
+	Keeps at most a given number of parsed programs, the least recently
+	used one is evicted first. Programs are keyed by the SHA-256 digest
+	of their source, so a changed source file is parsed again.
+	"""
+
+	DEFAULT_CAPACITY = 64
+
+	def __init__(self, capacity: int = DEFAULT_CAPACITY):
+		self._capacity = capacity
+		self._programs = OrderedDict()
+
+	@staticmethod
+	def key(source: bytes) -> bytes:
+		"""Computes cache key of a program source
+
+		Arguments:
+			source {bytes} -- XML source
+
+		Returns:
+			bytes -- SHA-256 digest
+		"""
+
+		from hashlib import sha256
+
+		return sha256(source).digest()
+
+	def get(self, key: bytes) -> tuple:
+		"""Returns cached program
+
+		Arguments:
+			key {bytes} -- program key
+
+		Returns:
+			tuple -- instruction list and jump label list, None if not cached
+		"""
+
+		program = self._programs.get(key)
+		if program is not None:
+			self._programs.move_to_end(key)
+
+		return program
+
+	def put(self, key: bytes, program: tuple):
+		"""Stores parsed program, evicts the least recently used one if full
+
+		Arguments:
+			key {bytes} -- program key
+			program {tuple} -- instruction list and jump label list
+		"""
+
+		self._programs[key] = program
+		self._programs.move_to_end(key)
+
+		if len(self._programs) > self._capacity:
+			self._programs.popitem(last=False)
+
+	def __len__(self):
+		return len(self._programs)
@@ -0,0 +1,284 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		checkpoint.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Snapshots of interpreter state for resuming long running programs
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import marshal
+import os
+import signal
+
+from sys import version_info
+from threading import current_thread, main_thread
+
+from src.value import Type, Value
+from src.exceptions import InputFileError
+from src.debug import Debug
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Checkpoint():
+	"""Interpreter state checkpoint
+
+	Writes snapshots of the interpreter state every given number of
+	instructions and whenever the process receives SIGUSR1. Requests are
+	checked in batches of instructions, the interpreter loop only counts
+	down to the next check.
+
+	A snapshot is written by a forked child process, which gets a copy of
+	the whole state at the moment of the fork, so the program continues
+	right away. A checkpoint is skipped while the previous child is still
+	writing. Platforms without fork write snapshots directly.
+
+	File layout: magic, format version, Python version, SHA-256 digest of
+	the compiled program and a marshalled state tuple. Values are stored
+	as (type, value) pairs and undefined frames as None. A checkpoint can
+	be resumed only by the same program compiled at the same optimization
+	level, since the state refers to instruction indices and variable
+	slots of the compiled program.
+	"""
+
+	MAGIC = b"IPPS"
+	VERSION = 1
+
+	HEADER = MAGIC + bytes((VERSION, version_info[0], version_info[1]))
+	DIGEST_SIZE = 32
+
+	# Instructions executed between checks of a pending checkpoint
+	CHECK_INTERVAL = 4096
+
+	SIGNAL = getattr(signal, "SIGUSR1", None)
+
+	def __init__(self, checkpoint_file: str, interval: int = 0):
+		self._checkpoint_file = checkpoint_file
+		self._interval = interval
+		self._remaining = interval
+		self._requested = False
+		self._child = None
+		self._previous_handler = None
+
+	def install(self):
+		"""Starts handling the checkpoint signal
+
+		Signal handlers can be set only in the main thread, checkpoints
+		of programs run in other threads are triggered by the interval only.
+		"""
+
+		if Checkpoint.SIGNAL is not None and current_thread() is main_thread():
+			self._previous_handler = signal.signal(Checkpoint.SIGNAL, self.__request)
+
+	def uninstall(self):
+		"""Restores the previous signal handler and waits for the last snapshot
+		"""
+
+		if self._previous_handler is not None:
+			signal.signal(Checkpoint.SIGNAL, self._previous_handler)
+			self._previous_handler = None
+
+		if self._child is not None:
+			os.waitpid(self._child, 0)
+			self._child = None
+
+	def __request(self, signum, frame):
+		self._requested = True
+
+	def countdown(self) -> int:
+		"""Returns number of instructions to execute before the next check
+
+		Returns:
+			int -- instruction count
+		"""
+
+		if self._interval:
+			return min(self._remaining, Checkpoint.CHECK_INTERVAL)
+
+		return Checkpoint.CHECK_INTERVAL
+
+	def due(self, executed: int) -> bool:
+		"""Checks whether a checkpoint should be written
+
+		Arguments:
+			executed {int} -- instructions executed since the last check
+
+		Returns:
+			bool -- True if the interval has elapsed or the signal was received
+		"""
+
+		if self._interval:
+			self._remaining -= executed
+			if self._remaining <= 0:
+				self._remaining = self._interval
+				self._requested = False
+				return True
+
+		if self._requested:
+			self._requested = False
+			self._remaining = self._interval
+			return True
+
+		return False
+
+	def save(self, digest: bytes, state: tuple):
+		"""Writes a snapshot of interpreter state
+
+		Arguments:
+			digest {bytes} -- digest of the compiled program
+			state {tuple} -- interpreter state, see Checkpoint.encode_value()
+							 for values
+		"""
+
+		if self._child is not None:
+			pid, _ = os.waitpid(self._child, os.WNOHANG)
+			if pid == 0:
+				Debug.printd("Checkpoint -> previous snapshot still being written, skipped")
+				return
+			self._child = None
+
+		if not hasattr(os, "fork"):
+			self.__write(digest, state)
+			return
+
+		pid = os.fork()
+		if pid:
+			self._child = pid
+			return
+
+		# Child process, exits without running any cleanup of the parent
+		try:
+			self.__write(digest, state)
+		finally:
+			os._exit(0)
+
+	def __write(self, digest: bytes, state: tuple):
+		"""Writes the checkpoint file
+
+		Failure to write a checkpoint is not an error, the program goes on
+		and the previous checkpoint stays in place.
+
+		Arguments:
+			digest {bytes} -- digest of the compiled program
+			state {tuple} -- interpreter state
+		"""
+
+		tmp_file = "{}.{}.tmp".format(self._checkpoint_file, os.getpid())
+
+		try:
+			with open(tmp_file, "wb") as f:
+				f.write(Checkpoint.HEADER)
+				f.write(digest)
+				marshal.dump(state, f)
+
+			# Atomic replace, a crash never leaves a partial checkpoint
+			os.replace(tmp_file, self._checkpoint_file)
+		except (OSError, ValueError) as e:
+			Debug.printd("Checkpoint -> unable to write", e)
+			return
+
+		Debug.printd("Checkpoint -> WRITTEN", self._checkpoint_file, "at instruction", state[0])
+
+	@staticmethod
+	def load(checkpoint_file: str, digest: bytes) -> tuple:
+		"""Loads interpreter state from a checkpoint file
+
+		Arguments:
+			checkpoint_file {str} -- checkpoint file
+			digest {bytes} -- digest of the compiled program
+
+		Raises:
+			InputFileError -- file not found, not a valid checkpoint or
+							  a checkpoint of another program
+
+		Returns:
+			tuple -- interpreter state
+		"""
+
+		try:
+			with open(checkpoint_file, "rb") as f:
+				data = f.read()
+		except OSError:
+			raise InputFileError("checkpoint '{}' not found".format(checkpoint_file))
+
+		header_len = len(Checkpoint.HEADER)
+		if data[:header_len] != Checkpoint.HEADER:
+			raise InputFileError("'{}' is not a valid checkpoint".format(checkpoint_file))
+
+		if data[header_len:header_len + Checkpoint.DIGEST_SIZE] != digest:
+			raise InputFileError("checkpoint '{}' belongs to another program or optimization level"
+								 .format(checkpoint_file))
+
+		try:
+			return marshal.loads(data[header_len + Checkpoint.DIGEST_SIZE:])
+		except (EOFError, ValueError, TypeError):
+			raise InputFileError("'{}' is not a valid checkpoint".format(checkpoint_file))
+
+	@staticmethod
+	def digest(program_data: tuple) -> bytes:
+		"""Computes digest identifying a compiled program
+
+		Arguments:
+			program_data {tuple} -- description of the program made of lists
+									of numbers and strings
+
+		Returns:
+			bytes -- SHA-256 digest
+		"""
+
+		from hashlib import sha256
+
+		# Marshalled data depends on string interning, its representation
+		# is the same in every process
+		return sha256(repr(program_data).encode()).digest()
+
+	@staticmethod
+	def encode_value(value: Value) -> tuple:
+		"""Converts a value into a marshallable pair
+
+		Arguments:
+			value {Value} -- value, None for an undefined variable
+
+		Returns:
+			tuple -- (type, value), None for an undefined variable
+		"""
+
+		if value is None:
+			return None
+
+		return (value.type, value.value)
+
+	@staticmethod
+	def decode_value(pair: tuple) -> Value:
+		"""Converts a stored pair back into a value
+
+		String buffers are restored as plain strings, the next in place
+		change creates a new buffer.
+
+		Arguments:
+			pair {tuple} -- (type, value), None for an undefined variable
+
+		Returns:
+			Value -- value, None for an undefined variable
+		"""
+
+		if pair is None:
+			return None
+
+		value_type, value = pair
+		if value_type == Type.NIL:
+			return Value.NIL
+		if value_type == Type.BOOL:
+			return Value.TRUE if value else Value.FALSE
+
+		return Value(value_type, value)
@@ -0,0 +1,127 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		compiler.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Compiler module lowers parsed instructions into a flat program
+#		   of pre-bound handlers executed by the interpreter
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from functools import partial
+
+from src.constants import Constant
+from src.value import Value
+from src.debug import Debug
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Compiler():
+	"""Program compiler
+
+	Lowers the instruction list created by the parser into a dense array
+	of callables sorted by instruction order. Every callable is a handler
+	bound to its target together with its already decoded operands, so
+	executing an instruction is a single call with no lookups.
+
+	Literal operands become shared typed values, variables become
+	(frame type, slot id) pairs and labels and types are passed as names.
+	Global frame variables get slot ids of the global frame, variables
+	of local and temporary frames share one slot numbering, as a temporary
+	frame becomes a local one and back.
+	"""
+
+	def __init__(self, instruction_list: dict):
+		self._instruction_list = instruction_list
+		self._program = list()
+		self._order_list = list()
+		self._opcode_list = list()
+		self._global_slots = dict()
+		self._local_slots = dict()
+
+	def run(self, target: object):
+		"""Executes compilation process
+
+		Arguments:
+			target {object} -- object providing a handler method for every opcode
+		"""
+
+		Debug.printd("Compiler -> START")
+
+		self._order_list = sorted(self._instruction_list)
+		self._opcode_list = [self._instruction_list[order][0] for order in self._order_list]
+		self._program = [
+			self.__compile_instruction(target, *self._instruction_list[order])
+			for order in self._order_list
+		]
+
+	def __compile_instruction(self, target: object, opcode: str, arguments: list) -> object:
+		"""Binds handler of an instruction to its operands
+
+		Arguments:
+			target {object} -- object providing handler methods
+			opcode {str} -- instruction opcode
+			arguments {list} -- decoded instruction arguments
+
+		Returns:
+			object -- callable executing the instruction
+		"""
+
+		handler = getattr(target, opcode)
+		arguments = [self.__compile_operand(arg) for arg in arguments]
+
+		return partial(handler, *arguments) if arguments else handler
+
+	def __compile_operand(self, arg: tuple) -> object:
+		"""Converts an instruction argument to its runtime form
+
+		Arguments:
+			arg {tuple} -- instruction argument (type, value)
+
+		Returns:
+			object -- Value of a literal, (frame type, slot id) of a variable,
+					  name of a label or type
+		"""
+
+		arg_type, arg_value = arg
+
+		if arg_type in ("label", "type"):
+			return arg_value
+		if arg_type != "var":
+			return Value.from_literal(arg_type, arg_value)
+
+		frame_type, var_name = arg_value
+		slots = self._global_slots if frame_type == Constant.GF else self._local_slots
+		slot = slots.setdefault(var_name, len(slots))
+
+		return (frame_type, slot)
+
+	@property
+	def program(self):
+		return self._program
+
+	@property
+	def order_list(self):
+		return self._order_list
+
+	@property
+	def opcode_list(self):
+		return self._opcode_list
+
+	@property
+	def global_names(self):
+		return list(self._global_slots)
+
+	@property
+	def local_names(self):
+		return list(self._local_slots)
@@ -30,6 +30,16 @@ class Constant:
 	STRING = 12
 	TYPE = 13
 
+	GF = 20
+	LF = 21
+	TF = 22
+
+	FRAME_TYPES = {
+		'GF': GF,
+		'LF': LF,
+		'TF': TF,
+	}
+
 	INSTR_LIST = {
 		
 		# Frame, function call instructions
@@ -96,11 +106,11 @@ class Constant:
 		TYPE: ('type'),
 	}
 
+	# String literals are validated by src.strings.String.parse
 	TYPE_VALUE_REGEX = {
 		'var': r"^(GF|LF|TF)@[_\-\$&%\*\w][_\-\$&%\*\w0-9]*$",
 		'label': r"^[_\-\$&%\*\w][_\-\$&%\*\w0-9]*$",
 		'int': r"^[-+]?\d+$",
-		'string': r"^(?!.*\\[^\d])(?!\\[\d]{1}[^\d])(?!\\[\d]{2}[^\d])(?:\w|[ -~]|\d)*(?<!(\\\d{0}))(?<!(\\\d{1}))(?<!(\\\d{2}))(?<!(\\))(?<!\s)$",
 		'bool': r"^(true|false)$",
 		'type': r"^(int|string|bool)$",
 	}
@@ -15,7 +15,6 @@
 #	Imports
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-from pprint import pprint
 from sys import stderr
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -25,37 +24,61 @@ from sys import stderr
 class Debug:
 	"""Debug log with colored tags (for Linux - Bash)
 
-	This class defines debug operations (if active)
+	This class defines debug operations (if active). Messages belong to
+	categories which can be enabled separately. Messages are formatted
+	only when their category is enabled; code producing messages in a loop
+	checks enabled() once before the loop, so disabled logging costs
+	nothing.
 	"""
 	_active = False
+	_categories = frozenset()
+
+	GENERAL = "general"
+	PARSER = "parser"
+	FRAMES = "frames"
+	DISPATCH = "dispatch"
+	CACHE = "cache"
+	JIT = "jit"
+
+	CATEGORIES = (GENERAL, PARSER, FRAMES, DISPATCH, CACHE, JIT)
 
 	DEBUG_TAG = "\033[38;5;202m" + "[ DEBUG ] " + "\033[0m"
 
 	@staticmethod
-	def printd(text="", *args):
+	def enabled(category=GENERAL):
+		"""Checks whether debug messages of a category are printed
+		"""
+		return category in Debug._categories
+
+	@staticmethod
+	def printd(text="", *args, category=GENERAL):
 		"""Debug print
 
-		Method prints debug message
+		Method prints debug message, arguments are converted
+		to strings only if the message is printed
 		"""
-		if Debug._active:
+		if category in Debug._categories:
 			print(Debug.DEBUG_TAG + text, file=stderr, end=" " if args else "")
 			for arg in args:
 				print(arg, end=" ", file=stderr)
 			print("\n", end="", file=stderr)
 
 	@staticmethod
-	def pprintd(obj):
+	def pprintd(obj, category=GENERAL):
 		"""Pretty debug print
 
 		Method prints out an object
 		"""
 		hr = "~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~"
 
-		if Debug._active:
+		if category in Debug._categories:
+			from pprint import pprint
+
 			print(Debug.DEBUG_TAG + hr, file=stderr)
 			pprint(obj, depth=10, stream=stderr)
 			print(Debug.DEBUG_TAG + hr, file=stderr)
 
 	@staticmethod
-	def active(flag):
+	def active(flag, categories=CATEGORIES):
 		Debug._active = flag
+		Debug._categories = frozenset(categories) if flag else frozenset()
@@ -44,151 +44,151 @@ class ExitCode:
 	VALUE_MISSING		 = 56
 	DIVISION_ZERO		 = 57
 	STRING_OPERATION	 = 58
+
+	# Execution limits
+	LIMIT_EXCEEDED		 = 60
+
 	INTERNAL_ERROR		 = 99
 
 
 class InterpreterError(Exception):
+	"""Interpreter error
+
+	Exit code is a class attribute of every error type and the message is
+	formatted only when the error is printed, so raising and catching
+	errors is cheap. The interpreter attaches order of the instruction
+	on which an error has occured, it is appended to the message.
+	"""
 
-	def __init__(self, message = "", code = ExitCode.INTERNAL_ERROR):
+	code = ExitCode.INTERNAL_ERROR
+	order = None
+
+	def __init__(self, message = "", code = None):
 		self._message = message
-		self._code = code
+		if code is not None:
+			self.code = code
 
 	def __str__(self):
-		return self._message
+		if self.order is None:
+			return self._describe()
+
+		return "{} on instruction {}".format(self._describe(), self.order)
 
-	@property
-	def code(self):
-		return self._code
+	def _describe(self):
+		return self._message
 
 
 class ArgumentsError(InterpreterError):
 
-	def __init__(self, message = ""):
-		super().__init__(message)
-		self._code = ExitCode.INVALID_ARGUMENTS
+	code = ExitCode.INVALID_ARGUMENTS
 
-	def __str__(self):
+	def _describe(self):
 		return "Program arguments - {}".format(self._message)
 
 
 class InputFileError(InterpreterError):
 
-	def __init__(self, message=""):
-		super().__init__(message)
-		self._code = ExitCode.INPUT_FILE_ERROR
+	code = ExitCode.INPUT_FILE_ERROR
 
-	def __str__(self):
+	def _describe(self):
 		return "Unable to open input file - {}".format(self._message)
 
 
 class OutputFileError(InterpreterError):
 
-	def __init__(self, message=""):
-		super().__init__(message)
-		self._code = ExitCode.OUTPUT_FILE_ERROR
+	code = ExitCode.OUTPUT_FILE_ERROR
 
-	def __str__(self):
+	def _describe(self):
 		return "Unable to open output file - {}".format(self._message)
 
 
 class XMLFormatError(InterpreterError):
 
-	def __init__(self, message=""):
-		super().__init__(message)
-		self._code = ExitCode.INVALID_XML_FORMAT
+	code = ExitCode.INVALID_XML_FORMAT
 
-	def __str__(self):
+	def _describe(self):
 		return "XML format error - {}".format(self._message)
 
 
 class ParserError(InterpreterError):
 
-	def __init__(self, message = ""):
-		super().__init__(message)
-		self._code = ExitCode.PARSER_ERROR
+	code = ExitCode.PARSER_ERROR
 
-	def __str__(self):
+	def _describe(self):
 		return "Source code error - {}".format(self._message)
 
 
 class InstructionOrderError(ParserError):
 
-	def __str__(self):
+	def _describe(self):
 		return "Invalid instruction order - {}".format(self._message)
 
 
 class SemanticError(InterpreterError):
 
-	def __init__(self, message=""):
-		super().__init__(message)
-		self._code = ExitCode.SEMANTIC_ERROR
+	code = ExitCode.SEMANTIC_ERROR
 
-	def __str__(self):
+	def _describe(self):
 		return "Semantic error - {}".format(self._message)
 
 
 class VariableRedefinedError(SemanticError):
 
-	def __str__(self):
+	def _describe(self):
 		return "Attempt to redefine variable '{}'".format(self._message)
 
 
 class UndefinedVariableError(SemanticError):
 
-	def __init__(self, message=""):
-		super().__init__(message)
-		self._code = ExitCode.UNDEFINED_VARIABLE
+	code = ExitCode.UNDEFINED_VARIABLE
 
-	def __str__(self):
+	def _describe(self):
 		return "Attempt to assign to an undefined variable '{}'".format(self._message)
 
 
 class UndefinedFrameError(SemanticError):
 
-	def __init__(self, message=""):
-		super().__init__(message)
-		self._code = ExitCode.UNDEFINED_FRAME
+	code = ExitCode.UNDEFINED_FRAME
 
-	def __str__(self):
+	def _describe(self):
 		return "Attempt to use an undefined frame"
 
 class TypeMismatchError(SemanticError):
 
-	def __str__(self):
+	def _describe(self):
 		return "Type mismatch has occured - {}".format(self._message)
 
 class ValueMissingError(SemanticError):
 
-	def __init__(self, message=""):
-		super().__init__(message)
-		self._code = ExitCode.VALUE_MISSING
+	code = ExitCode.VALUE_MISSING
 
-	def __str__(self):
+	def _describe(self):
 		return "Required value is missing {}".format(self._message)
 
 class InvalidOperandError(SemanticError):
 
-	def __init__(self, message=""):
-		super().__init__(message)
-		self._code = ExitCode.INVALID_OPERAND
+	code = ExitCode.INVALID_OPERAND
 
-	def __str__(self):
+	def _describe(self):
 		return "Invalid operand - {}".format(self._message)
 
 class DivisionZeroError(SemanticError):
 
-	def __init__(self, message=""):
-		super().__init__(message)
-		self._code = ExitCode.DIVISION_ZERO
+	code = ExitCode.DIVISION_ZERO
 
-	def __str__(self):
+	def _describe(self):
 		return "Division by zero"
 
 class StringOperationError(SemanticError):
-	
-	def __init__(self, message=""):
-		super().__init__(message)
-		self._code = ExitCode.STRING_OPERATION
 
-	def __str__(self):
+	code = ExitCode.STRING_OPERATION
+
+	def _describe(self):
 		return "String operation - {}".format(self._message)
+
+class LimitExceededError(InterpreterError):
+
+	code = ExitCode.LIMIT_EXCEEDED
+
+	def _describe(self):
+		return "Execution limit exceeded - {}".format(self._message)
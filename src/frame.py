@@ -17,6 +17,7 @@
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 from src.constants import Constant
+from src.value import Value
 from src.exceptions import *
 from src.debug import Debug
 
@@ -25,97 +26,170 @@ from src.debug import Debug
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 class Frame():
+	"""Array backed frame
 
-	def __init__(self, defined = False):
-		self._defined = defined
-		self._variables = dict()
+	Variables are known before the program runs, so each of them is
+	assigned a fixed slot id at compile time and the frame stores values
+	in a list indexed by these ids. The global frame has slots for global
+	variables, local and temporary frames share slots of all variables
+	defined in these frames. An empty slot (None) stands for an undefined
+	variable, names of slots are kept for error messages only.
+	"""
 
-	def define_variable(self, var: str):
-		"""Defines a variable of a given name within the frame
+	__slots__ = ('_names', '_slots')
+
+	UNINITIALIZED = Value.NIL
+
+	# Frame accesses do not check whether the frame is defined,
+	# an undefined frame is an UndefinedFrame instance
+	defined = True
+
+	def __init__(self, names: list):
+		self._names = names
+		self._slots = [None] * len(names)
+
+	def define_variable(self, slot: int):
+		"""Defines a variable stored in a given slot
 		
 		Arguments:
-			var {str} -- variable name
+			slot {int} -- variable slot id
 		
 		Raises:
-			UndefinedFrameError -- Attempt to use an undefined frame
 			VariableRedefinedError -- Attempt to redefine variable
 		"""
 
-		if not self._defined:
-			raise UndefinedFrameError()
-		if var in self._variables:
-			raise VariableRedefinedError(var)
+		if self._slots[slot] is not None:
+			raise VariableRedefinedError(self._names[slot])
 
-		self._variables[var] = None
+		self._slots[slot] = Frame.UNINITIALIZED
 
-	def assign_value(self, var: str, value: tuple):
-		"""Assigns value to a given variable
+	def assign_value(self, slot: int, value: Value):
+		"""Assigns value to a variable stored in a given slot
 		
 		Arguments:
-			var {str} -- variable name
-			value {tuple} -- value to be assigned
+			slot {int} -- variable slot id
+			value {Value} -- value to be assigned
 		
 		Raises:
-			UndefinedFrameError -- Attempt to use an undefined frame
 			UndefinedVariableError -- Attempt to assign to an undefined variable
 		"""
 
-		if not self._defined:
-			raise UndefinedFrameError()
-		if var not in self._variables:
-			raise UndefinedVariableError(var)
+		if self._slots[slot] is None:
+			raise UndefinedVariableError(self._names[slot])
 
-		self._variables[var] = value
+		self._slots[slot] = value
 
-	def get_value(self, var: str) -> tuple:
-		"""Returns value stored in the given variable
+	def get_value(self, slot: int) -> Value:
+		"""Returns value stored in a given slot
 		
 		Arguments:
-			var {str} -- variable name
+			slot {int} -- variable slot id
 		
 		Raises:
-			UndefinedFrameError -- Attempt to use an undefined frame
 			UndefinedVariableError -- Attempt to assign to an undefined variable
 		
 		Returns:
-			tuple -- variable value
+			Value -- variable value, Value.NIL if uninitialized
 		"""
 
-		if not self._defined:
-			raise UndefinedFrameError()
-		if var not in self._variables:
-			raise UndefinedVariableError(var)
-		
-		value = self._variables[var]
+		value = self._slots[slot]
 
-		if not value:
-			return (None, None)
-		else:
-			return value 
+		if value is None:
+			raise UndefinedVariableError(self._names[slot])
 
+		return value
 
-	@property
-	def defined(self):
-		return self._defined
+	def clear(self, empty_slots: list):
+		"""Undefines all variables of the frame
 
-	@defined.setter
-	def defined(self, state: bool):
-		self._defined = state
+		Arguments:
+			empty_slots {list} -- list of None of the frame size
+		"""
+
+		self._slots[:] = empty_slots
+
+	@property
+	def slots(self):
+		return self._slots
 
 	@property
 	def variables(self):
-		return self._variables
-	
-	@variables.setter
-	def variables(self, value):
-		self._variables = value
+		return {
+			name: value for name, value in zip(self._names, self._slots)
+			if value is not None
+		}
 
 	def __repr__(self):
 		frame_dump = ""
-		for key, value in self._variables.items():
-			if value == None:
-				frame_dump += "{} =".format(key)
-			else:
-				frame_dump += "{} = <{}> {}\n".format(key, value[0], value[1])
+		for name, value in self.variables.items():
+			frame_dump += "{} = {!r}\n".format(name, value)
 
 		return frame_dump
+
+
+class UndefinedFrame(Frame):
+	"""Frame which does not exist, e.g. the temporary frame before CREATEFRAME
+
+	Every access raises UndefinedFrameError, a single shared instance
+	Frame.UNDEFINED is used.
+	"""
+
+	__slots__ = ()
+
+	defined = False
+
+	def __init__(self):
+		super().__init__([])
+
+	def define_variable(self, slot: int):
+		raise UndefinedFrameError()
+
+	def assign_value(self, slot: int, value: Value):
+		raise UndefinedFrameError()
+
+	def get_value(self, slot: int) -> Value:
+		raise UndefinedFrameError()
+
+
+Frame.UNDEFINED = UndefinedFrame()
+
+
+class FramePool():
+	"""Allocator of local and temporary frames
+
+	Recursive functions create and discard a frame on every call, so
+	discarded frames are kept and reused by later CREATEFRAME instead of
+	allocating new ones. A frame may be released only if nothing refers
+	to it anymore, i.e. a temporary frame replaced by CREATEFRAME.
+	"""
+
+	# Released frames above this count are left to the garbage collector
+	MAX_FREE = 256
+
+	def __init__(self, names: list):
+		self._names = names
+		self._empty_slots = [None] * len(names)
+		self._free = list()
+
+	def allocate(self) -> Frame:
+		"""Returns an empty frame
+
+		Returns:
+			Frame -- frame without variables
+		"""
+
+		if self._free:
+			return self._free.pop()
+
+		return Frame(self._names)
+
+	def release(self, frame: Frame):
+		"""Returns a frame no longer in use to the pool
+
+		Arguments:
+			frame {Frame} -- discarded frame
+		"""
+
+		if frame.defined and len(self._free) < FramePool.MAX_FREE:
+			frame.clear(self._empty_slots)
+			self._free.append(frame)
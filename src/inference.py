@@ -0,0 +1,267 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		inference.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Dataflow type inference over the parsed instruction list
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from src.constants import Constant
+from src.value import Type
+from src.debug import Debug
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TypeInference():
+	"""Type inference
+
+	Finds instructions whose operands have the same types every time they
+	are executed, so their runtime type checks can never fail. Types of
+	variables are sets of possible types stored as bit masks, one bit per
+	value type and one for an undefined variable or frame. The analysis
+	walks the control flow graph of instructions until the types of all
+	variables before every instruction stop growing.
+
+	Calls are not analysed per call site: a call continues to its label
+	and every RETURN continues after every CALL. A popped local frame
+	may be any of the frames pushed before, so its variables may have
+	any type.
+	"""
+
+	NIL = 1 << Type.NIL
+	INT = 1 << Type.INT
+	BOOL = 1 << Type.BOOL
+	STRING = 1 << Type.STRING
+	UNDEFINED = 1 << 4
+
+	VALUES = NIL | INT | BOOL | STRING
+	ANY = VALUES | UNDEFINED
+
+	LITERALS = {'int': INT, 'bool': BOOL, 'string': STRING}
+
+	# Types of results stored into the first argument, MOVE and READ
+	# store the type of their operand
+	RESULT_TYPES = {
+		'DEFVAR': NIL, 'POPS': VALUES,
+		'ADD': INT, 'SUB': INT, 'MUL': INT, 'IDIV': INT,
+		'LT': BOOL, 'GT': BOOL, 'EQ': BOOL,
+		'AND': BOOL, 'OR': BOOL, 'NOT': BOOL,
+		'INT2CHAR': STRING, 'STRI2INT': INT,
+		'CONCAT': STRING, 'STRLEN': INT, 'GETCHAR': STRING, 'SETCHAR': STRING,
+		'TYPE': STRING,
+	}
+
+	# Operand types for which type checks of an instruction always pass
+	COMPARABLE = ((INT, INT), (BOOL, BOOL), (STRING, STRING))
+	CHECKED_OPERANDS = {
+		'ADD': ((INT, INT),), 'SUB': ((INT, INT),),
+		'MUL': ((INT, INT),), 'IDIV': ((INT, INT),),
+		'LT': COMPARABLE, 'GT': COMPARABLE, 'EQ': COMPARABLE,
+		'JUMPIFEQ': COMPARABLE + ((NIL, NIL),), 'JUMPIFNEQ': COMPARABLE + ((NIL, NIL),),
+		'CONCAT': ((STRING, STRING),), 'STRLEN': ((STRING,),), 'GETCHAR': ((STRING, INT),),
+	}
+
+	def __init__(self, instruction_list: dict, jump_label_list: dict):
+		self._instruction_list = instruction_list
+		self._jump_label_list = jump_label_list
+		self._order_list = sorted(instruction_list)
+		self._global_ids = dict()
+		self._local_ids = dict()
+		self._unchecked_orders = set()
+
+	def run(self):
+		"""Executes the inference and finds instructions with proven operand types
+		"""
+
+		self.__number_variables()
+		states = self.__solve()
+
+		for index, order in enumerate(self._order_list):
+			opcode, args = self._instruction_list[order]
+			if states[index] is None or opcode not in TypeInference.CHECKED_OPERANDS:
+				continue
+
+			types = tuple(self.__operand_type(states[index], arg) for arg in args[1:])
+			if types in TypeInference.CHECKED_OPERANDS[opcode]:
+				self._unchecked_orders.add(order)
+
+		Debug.printd("TypeInference -> proved operand types of",
+					 len(self._unchecked_orders), "instructions")
+
+	def __number_variables(self):
+		"""Assigns state positions to variables
+
+		A global variable has a single position, a local variable name has
+		one position in the local frame followed by one in the temporary
+		frame, so frames can be moved as position ranges.
+		"""
+
+		for opcode, args in self._instruction_list.values():
+			for arg_type, arg_value in args:
+				if arg_type != "var":
+					continue
+
+				frame_type, name = arg_value
+				ids = self._global_ids if frame_type == Constant.GF else self._local_ids
+				ids.setdefault(name, len(ids))
+
+		self._local_start = len(self._global_ids)
+		self._tmp_start = self._local_start + len(self._local_ids)
+		self._state_size = self._tmp_start + len(self._local_ids)
+
+	def __solve(self) -> list:
+		"""Computes types of variables before every instruction
+
+		Returns:
+			list -- state (list of type masks) of every instruction index,
+					None for unreachable instructions
+		"""
+
+		instr_count = len(self._order_list)
+		states = [None] * instr_count
+		if not instr_count:
+			return states
+
+		return_sites = [
+			index + 1 for index, order in enumerate(self._order_list)
+			if self._instruction_list[order][0] == 'CALL'
+		]
+
+		# No variable and no frame except the global one is defined at start
+		states[0] = [TypeInference.UNDEFINED] * self._state_size
+		pending = [0]
+
+		while pending:
+			index = pending.pop()
+			opcode, args = self._instruction_list[self._order_list[index]]
+			state = self.__transfer(states[index], opcode, args)
+
+			for successor in self.__successors(index, opcode, args, return_sites):
+				if successor >= instr_count:
+					continue
+
+				old_state = states[successor]
+				if old_state is None:
+					states[successor] = state
+				else:
+					new_state = [old | new for old, new in zip(old_state, state)]
+					if new_state == old_state:
+						continue
+					states[successor] = new_state
+
+				pending.append(successor)
+
+		return states
+
+	def __successors(self, index: int, opcode: str, args: list, return_sites: list) -> list:
+		"""Finds instructions which may be executed after an instruction
+
+		Arguments:
+			index {int} -- instruction index
+			opcode {str} -- instruction opcode
+			args {list} -- instruction arguments
+			return_sites {list} -- indices of instructions following a CALL
+
+		Returns:
+			list -- successor indices, jumps to undefined labels end the program
+		"""
+
+		if opcode == 'RETURN':
+			return return_sites
+
+		successors = list()
+		if opcode in ('JUMP', 'JUMPIFEQ', 'JUMPIFNEQ', 'CALL') and args[0][1] in self._jump_label_list:
+			successors.append(self._jump_label_list[args[0][1]])
+		if opcode != 'JUMP' and opcode != 'CALL':
+			successors.append(index + 1)
+
+		return successors
+
+	def __transfer(self, state: list, opcode: str, args: list) -> list:
+		"""Computes types of variables after an instruction
+
+		Arguments:
+			state {list} -- types of variables before the instruction
+			opcode {str} -- instruction opcode
+			args {list} -- instruction arguments
+
+		Returns:
+			list -- types of variables after the instruction
+		"""
+
+		local_start, tmp_start = self._local_start, self._tmp_start
+		local_count = tmp_start - local_start
+		undefined_frame = [TypeInference.UNDEFINED] * local_count
+
+		if opcode == 'CREATEFRAME':
+			return state[:tmp_start] + undefined_frame
+		if opcode == 'PUSHFRAME':
+			return state[:local_start] + state[tmp_start:] + undefined_frame
+		if opcode == 'POPFRAME':
+			return state[:local_start] + [TypeInference.ANY] * local_count + state[local_start:tmp_start]
+
+		if opcode == 'MOVE':
+			result = self.__operand_type(state, args[1]) & TypeInference.VALUES
+		elif opcode == 'READ':
+			result = 1 << Type.FROM_NAME[args[1][1]]
+		elif opcode in TypeInference.RESULT_TYPES:
+			result = TypeInference.RESULT_TYPES[opcode]
+		else:
+			return state
+
+		state = list(state)
+		state[self.__position(args[0][1])] = result
+
+		return state
+
+	def __operand_type(self, state: list, arg: tuple) -> int:
+		"""Returns possible types of an operand
+
+		Arguments:
+			state {list} -- types of variables
+			arg {tuple} -- instruction argument (type, value)
+
+		Returns:
+			int -- type mask
+		"""
+
+		arg_type, arg_value = arg
+
+		if arg_type == "var":
+			return state[self.__position(arg_value)]
+
+		return TypeInference.LITERALS[arg_type]
+
+	def __position(self, var: tuple) -> int:
+		"""Returns state position of a variable
+
+		Arguments:
+			var {tuple} -- variable (frame type, name)
+
+		Returns:
+			int -- position
+		"""
+
+		frame_type, name = var
+
+		if frame_type == Constant.GF:
+			return self._global_ids[name]
+		if frame_type == Constant.LF:
+			return self._local_start + self._local_ids[name]
+
+		return self._tmp_start + self._local_ids[name]
+
+	@property
+	def unchecked_orders(self):
+		return self._unchecked_orders
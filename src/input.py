@@ -0,0 +1,134 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		input.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Buffered program input
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import os
+import stat
+import sys
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class InputReader():
+	"""Program input reader
+
+	Reads the input stream (standard input by default) in large chunks
+	and hands out lines one by one; a chunk is split into lines only
+	when the previous one is used up. Only regular files and in-memory
+	streams are read in chunks. Interactive streams (terminals, pipes and
+	sockets, whose other end may wait for the program's output) are read
+	line by line, so a READ instruction never waits for more input than
+	it needs.
+
+	The reader owns its stream, close() closes it unless it is the
+	standard input; the reader may be used as a context manager.
+	"""
+
+	CHUNK_SIZE = 64 * 1024
+
+	def __init__(self, stream: object = None, chunk_size: int = CHUNK_SIZE):
+		self._stream = stream if stream is not None else sys.stdin
+		self._chunk_size = chunk_size
+
+		self._lines = list()
+		self._index = 0
+		self._tail = ""
+		self._eof = False
+		self._line_count = 0
+
+		try:
+			self._interactive = not stat.S_ISREG(os.fstat(self._stream.fileno()).st_mode)
+		except (AttributeError, OSError, ValueError):
+			# In-memory streams have no file descriptor
+			self._interactive = False
+
+	def close(self):
+		"""Closes the input stream, the standard input is left open
+		"""
+
+		if self._stream is not sys.stdin:
+			self._stream.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def readline(self) -> str:
+		"""Returns next line without the line terminator
+
+		Returns:
+			str -- line of input, None at the end of input
+		"""
+
+		if self._index >= len(self._lines) and not self.__fill():
+			return None
+
+		line = self._lines[self._index]
+		self._index += 1
+		self._line_count += 1
+
+		return line
+
+	def skip(self, count: int):
+		"""Skips lines already read by an earlier run
+
+		Arguments:
+			count {int} -- number of lines to skip
+		"""
+
+		for _ in range(count):
+			if self.readline() is None:
+				break
+
+	def __fill(self) -> bool:
+		"""Reads next block of lines from the stream
+
+		Returns:
+			bool -- False if there is nothing left to read
+		"""
+
+		self._lines.clear()
+		self._index = 0
+
+		while not self._lines:
+			if self._eof:
+				return False
+
+			chunk = self._stream.readline() if self._interactive else self._stream.read(self._chunk_size)
+
+			if not chunk:
+				# Last line may not be terminated by a new line
+				self._eof = True
+				if self._tail:
+					self._lines.append(self._tail)
+					self._tail = ""
+				continue
+
+			self._lines = (self._tail + chunk).split("\n")
+			self._tail = self._lines.pop()
+
+		return True
+
+	@property
+	def interactive(self):
+		return self._interactive
+
+	@property
+	def line_count(self):
+		return self._line_count
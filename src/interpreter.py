@@ -16,10 +16,19 @@
 #	Imports
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 	
-import re
-
-from src.parser import Parser
-from src.frame import Frame
+from sys import stderr
+from time import perf_counter_ns
+from itertools import repeat
+from operator import add, sub, mul, floordiv, lt, gt, eq, and_, or_, not_
+
+from src.optimizer import Optimizer
+from src.compiler import Compiler
+from src.cache import ProgramCache
+from src.output import OutputWriter
+from src.input import InputReader
+from src.frame import Frame, FramePool
+from src.limits import ExecutionLimits
+from src.value import Type, Value, StringBuffer
 from src.constants import Constant
 from src.exceptions import *
 from src.debug import Debug
@@ -30,23 +39,44 @@ from src.debug import Debug
 
 class Interpreter:
 
-	def __init__(self, source_file):		
+	FRAME_OPCODES = ('CREATEFRAME', 'PUSHFRAME', 'POPFRAME', 'DEFVAR')
+
+	def __init__(self, source_file, streaming=False, cache_dir=None, output=None,
+				 input_reader=None, opt_level=Optimizer.DEFAULT_LEVEL, profile=None,
+				 parsed_program=None, checkpoint_file=None, checkpoint_interval=0,
+				 resume_file=None, max_instructions=None, timeout=None):		
 		self._source_file = source_file
+		self._streaming = streaming
+		self._cache_dir = cache_dir
+		self._opt_level = opt_level
+		self._profile = profile
+		self._checkpoint_file = checkpoint_file
+		self._checkpoint_interval = checkpoint_interval
+		self._resume_file = resume_file
+		self._limits = None
+		if max_instructions is not None or timeout is not None:
+			self._limits = ExecutionLimits(max_instructions, timeout)
+		self._parsed_program = parsed_program
+		self._output = output if output is not None else OutputWriter()
+		self._input = input_reader if input_reader is not None else InputReader()
 		
 		self._instr_list = dict()
+		self._program = list()
 		self._instr_order_list = list()
+		self._instr_opcode_list = list()
 		self._jump_label_list = dict()	
 		
 		self._instr_index = 0
-		self._instr_args = list()
 
-		self._tmp_frame = Frame(False)
-		self._global_frame = Frame(True)
-		self._local_frame = Frame(False)
+		self._tmp_frame = Frame.UNDEFINED
+		self._global_frame = Frame([])
+		self._frame_pool = FramePool([])
 
 		self._call_stack = list()
 		self._data_stack = list()
 		self._local_frame_stack = list()
+		# Top of the local frame stack, kept apart for fast variable access
+		self._local_frame = Frame.UNDEFINED
 
 	def run(self):
 		"""Runs the interpreter
@@ -56,103 +86,399 @@ class Interpreter:
 		
 		try:
 			self.__parse()
+			self.__compile()
+			if self._resume_file is not None:
+				self.__resume()
 			self.__process()
-		except InterpreterError:
-			raise
+		finally:
+			self._output.flush()
 
 	def __parse(self):
 		"""Parses and sets up interpreter variables
+
+		If caching is enabled (cache directory is not None), a previously
+		parsed program is loaded from the cache instead of parsing
+		an unchanged source file. An already parsed program (instruction
+		list and jump label list) may be also given directly, it is not
+		modified, so it can be shared by several runs. A source file with
+		the cache file suffix is loaded as a precompiled program.
+
+		The parser (and the XML library) is imported only if the program
+		is really parsed.
 		"""
 
+		if self._parsed_program is not None:
+			self._instr_list, self._jump_label_list = self._parsed_program
+			return
+
+		if self._source_file.endswith(ProgramCache.SUFFIX):
+			Debug.printd("Interpreter -> LOADING PRECOMPILED..")
+			self._instr_list, self._jump_label_list = ProgramCache.read(self._source_file)
+			return
+
+		cache = None
+		if self._cache_dir is not None:
+			cache = ProgramCache(self._source_file, self._cache_dir)
+			cached_program = cache.load()
+			if cached_program is not None:
+				self._instr_list, self._jump_label_list = cached_program
+				return
+
+		from src.parser import Parser
+
 		Debug.printd("Interpreter -> PARSING..")
-		parser = Parser(self._source_file)
+		parser = Parser(self._source_file, self._streaming)
 		
-		try:
-			parser.run()
-		except InterpreterError:
-			raise
+		parser.run()
 
 		self._instr_list = parser.instruction_list
 		self._jump_label_list = parser.jump_label_list
-		self._instr_order_list = list(self._instr_list.keys())
-		self._instr_order_list.sort()
+
+		if cache is not None:
+			cache.store(self._instr_list, self._jump_label_list)
+
+	def __compile(self):
+		"""Optimizes and lowers parsed instructions into a program of bound
+		   handlers
+		"""
+
+		Debug.printd("Interpreter -> OPTIMIZING..")
+		optimizer = Optimizer(self._instr_list, self._jump_label_list, self._opt_level)
+		optimizer.run()
+
+		self._jump_label_list = optimizer.jump_label_list
+
+		Debug.printd("Interpreter -> COMPILING..")
+		compiler = Compiler(optimizer.instruction_list)
+		compiler.run(self)
+
+		self._program = compiler.program
+		self._instr_order_list = compiler.order_list
+		self._instr_opcode_list = compiler.opcode_list
+		self._global_frame = Frame(compiler.global_names)
+		self._frame_pool = FramePool(compiler.local_names)
+		self._slot_names = (compiler.global_names, compiler.local_names)
+
+		# Parsed instructions are not needed during execution
+		self._instr_list = None
 
 	def __process(self):
-		"""Interpreter loop executes parsed instructions
+		"""Interpreter loop executes compiled instructions
+
+		Handlers raise errors without knowing their position, the order of
+		the failing instruction is attached by the single handler here.
+
+		Raises:
+			InterpreterError -- Raised exception with added order of an instruction
+								on which an error has occured
+			OutputFileError -- unable to write the profile of a successful program
 		"""
 
 		Debug.printd("Interpreter -> PROCESSING..")
-		instr_count = len(self._instr_order_list)
 
-		while self._instr_index < instr_count:
-			try:
-				self.__execute_instr()
-			except InterpreterError:
+		program = self._program
+		instr_count = len(program)
+
+		profiler = None
+		if self._profile is not None:
+			from src.profiler import Profiler
+
+			profiler = Profiler(self._instr_order_list, self._instr_opcode_list, self._profile)
+
+		completed = False
+		try:
+			if profiler is not None:
+				self.__process_profiled(profiler)
+			elif self._limits is not None or self._checkpoint_file is not None:
+				self.__process_batched()
+			elif Debug.enabled(Debug.DISPATCH) or Debug.enabled(Debug.FRAMES):
+				self.__process_traced()
+			else:
+				if self._opt_level >= Optimizer.JIT_LEVEL:
+					self.__install_jit()
+
+				while self._instr_index < instr_count:
+					program[self._instr_index]()
+					self._instr_index += 1
+
+			completed = True
+		except InterpreterError as e:
+			e.order = self._instr_order_list[self._instr_index]
+			raise
+		finally:
+			if profiler is not None:
+				self.__report_profile(profiler, completed)
+
+	def __report_profile(self, profiler: object, completed: bool):
+		"""Produces the profile report when the program ends, including on errors
+
+		Failure to write the report of a failed program is only printed, so
+		it does not replace the program's own error and exit code.
+
+		Arguments:
+			profiler {Profiler} -- profiler of the run
+			completed {bool} -- False if the program ended by an error
+
+		Raises:
+			OutputFileError -- unable to write the report of a completed program
+		"""
+
+		try:
+			profiler.report()
+		except OutputFileError as e:
+			if completed:
 				raise
+			print("[ ERROR ]", e, file=stderr)
+
+	def __install_jit(self):
+		"""Lets the loop compiler replace hot loops of the program
+
+		Used only by the main loop, traced and profiled runs interpret
+		every instruction.
+		"""
+
+		from src.jit import JIT
+
+		JIT(self, self._program, self._instr_opcode_list, self._instr_order_list,
+			self._jump_label_list).install()
+
+	def __process_traced(self):
+		"""Interpreter loop printing executed instructions and frame changes
+
+		Used instead of the main loop only if dispatch or frames debugging
+		is enabled, so the main loop does not check debug settings.
+		"""
+
+		trace_dispatch = Debug.enabled(Debug.DISPATCH)
+		trace_frames = Debug.enabled(Debug.FRAMES)
+
+		program = self._program
+		instr_count = len(program)
+
+		while self._instr_index < instr_count:
+			opcode = self._instr_opcode_list[self._instr_index]
+
+			if trace_dispatch:
+				Debug.printd("Executing", self._instr_order_list[self._instr_index], opcode,
+							 category=Debug.DISPATCH)
+
+			program[self._instr_index]()
+
+			if trace_frames and opcode in Interpreter.FRAME_OPCODES:
+				Debug.pprintd({
+					"GF": self._global_frame.variables,
+					"LF": [frame.variables for frame in self._local_frame_stack],
+					"TF": self._tmp_frame.variables if self._tmp_frame.defined else None
+				}, category=Debug.FRAMES)
 
 			self._instr_index += 1
 
-	def __execute_instr(self):
-		"""Executes instruction based on its opcode
-		
+	def __process_profiled(self, profiler: object):
+		"""Interpreter loop counting executions and time of instructions
+
+		Used instead of the main loop only if profiling is enabled.
+
+		Arguments:
+			profiler {Profiler} -- profiler collecting the counters
+		"""
+
+		counts = profiler.counts
+		times = profiler.times
+		taken = profiler.taken
+		fallthrough = profiler.fallthrough
+
+		program = self._program
+		instr_count = len(program)
+
+		while self._instr_index < instr_count:
+			index = self._instr_index
+
+			start = perf_counter_ns()
+			program[index]()
+			times[index] += perf_counter_ns() - start
+
+			counts[index] += 1
+			if self._instr_index != fallthrough[index]:
+				taken[index] += 1
+
+			self._instr_index += 1
+
+	def __process_batched(self):
+		"""Interpreter loop checking execution limits and writing checkpoints
+
+		Used instead of the main loop only if execution limits or checkpoints
+		are enabled. Instructions are executed in batches up to the next
+		check of a limit or a pending checkpoint. The program is extended
+		by a halting instruction, which keeps the position at the end of
+		the program, so batches need not check for the end of the program.
+		The output is flushed before every checkpoint, so its position
+		matches the output really written.
+
 		Raises:
-			InterpreterError -- Raised exception with added order of an instruction
-								on which an error has occured
+			LimitExceededError -- an execution limit is exceeded
 		"""
 
-		instr_order = self._instr_order_list[self._instr_index]	
-		instr = self._instr_list[instr_order]
-		instr_opcode = instr[0]
-	
-		self._instr_args = instr[1]
+		limits = self._limits
+		checkpoint = None
+		if self._checkpoint_file is not None:
+			from src.checkpoint import Checkpoint
+
+			checkpoint = Checkpoint(self._checkpoint_file, self._checkpoint_interval)
+			digest = self.__program_digest()
+
+		controls = [control for control in (limits, checkpoint) if control is not None]
+
+		instr_count = len(self._program)
+		program = self._program + [self.__halt]
+
+		if limits is not None:
+			limits.start()
+		if checkpoint is not None:
+			checkpoint.install()
 
 		try:
-			# Execute method based on instruction's opcode
-			getattr(self, instr_opcode)()
-		except InterpreterError as e:
-			raise InterpreterError(str(e) + " on instruction {}".format(instr_order), e.code)
-	
+			while self._instr_index < instr_count:
+				batch = min(control.countdown() for control in controls)
+				for _ in repeat(None, batch):
+					program[self._instr_index]()
+					self._instr_index += 1
+
+				if self._instr_index >= instr_count:
+					break
+
+				if limits is not None:
+					limits.check(batch)
+
+				if checkpoint is not None and checkpoint.due(batch):
+					self._output.flush()
+					checkpoint.save(digest, self.__checkpoint_state())
+		finally:
+			if checkpoint is not None:
+				checkpoint.uninstall()
+
+	def __halt(self):
+		# Stays past the last instruction
+		self._instr_index -= 1
+
+	def __program_digest(self) -> bytes:
+		"""Computes digest of the compiled program identifying its checkpoints
+
+		Returns:
+			bytes -- SHA-256 digest
+		"""
+
+		from src.checkpoint import Checkpoint
 
-	def MOVE(self):
-		value = self.__get_arg_value(self._instr_args[1])
+		return Checkpoint.digest(
+			(self._instr_order_list, self._instr_opcode_list) + self._slot_names
+		)
+
+	def __checkpoint_state(self) -> tuple:
+		"""Collects interpreter state for a checkpoint
+
+		Returns:
+			tuple -- (instruction index, global frame, local frame stack,
+					 temporary frame, call stack, data stack, output position,
+					 input line count)
+		"""
+
+		from src.checkpoint import Checkpoint
+
+		encode = Checkpoint.encode_value
+
+		def frame_state(frame):
+			return [encode(value) for value in frame.slots] if frame.defined else None
+
+		return (
+			self._instr_index,
+			frame_state(self._global_frame),
+			[frame_state(frame) for frame in self._local_frame_stack],
+			frame_state(self._tmp_frame),
+			list(self._call_stack),
+			[encode(value) for value in self._data_stack],
+			self._output.position,
+			self._input.line_count
+		)
+
+	def __resume(self):
+		"""Restores interpreter state from a checkpoint
+
+		Input lines read before the checkpoint are skipped, so the same
+		input has to be given again. Output continues at the position
+		stored in the checkpoint.
+
+		Raises:
+			InputFileError -- invalid checkpoint or checkpoint of another program
+		"""
+
+		from src.checkpoint import Checkpoint
+
+		state = Checkpoint.load(self._resume_file, self.__program_digest())
+		(instr_index, global_slots, local_frames, tmp_slots,
+		 call_stack, data_stack, output_position, input_line_count) = state
+
+		decode = Checkpoint.decode_value
+
+		def restore_frame(frame, slots):
+			frame.slots[:] = [decode(value) for value in slots]
+			return frame
+
+		restore_frame(self._global_frame, global_slots)
+		self._local_frame_stack = [
+			restore_frame(self._frame_pool.allocate(), slots) for slots in local_frames
+		]
+		self._local_frame = self._local_frame_stack[-1] if self._local_frame_stack else Frame.UNDEFINED
+		self._tmp_frame = (
+			restore_frame(self._frame_pool.allocate(), tmp_slots) if tmp_slots is not None
+			else Frame.UNDEFINED
+		)
+
+		self._call_stack = list(call_stack)
+		self._data_stack = [decode(value) for value in data_stack]
+		self._output.continue_at(output_position)
+		self._input.skip(input_line_count)
+		self._instr_index = instr_index
+
+		Debug.printd("Interpreter -> RESUMED at instruction", instr_index,
+					 "output position", output_position, "input line", input_line_count)
+
+	def MOVE(self, var, symb):
+		value = self.__get_arg_value(symb)
+		if value.__class__ is StringBuffer:
+			value = value.freeze()
 	
-		try:
-			self.__write_var(self._instr_args[0], value)
-		except InterpreterError:
-			raise
+		self.__write_var(var, value)
 
 	def CREATEFRAME(self):
-		self._tmp_frame.defined = True
-		self._tmp_frame.variables = {}
+		# Replaced temporary frame is not referenced anymore
+		self._frame_pool.release(self._tmp_frame)
+		self._tmp_frame = self._frame_pool.allocate()
 
 	def PUSHFRAME(self):
 		if not self._tmp_frame.defined:
 			raise UndefinedFrameError()
 
+		self._local_frame_stack.append(self._tmp_frame)
 		self._local_frame = self._tmp_frame
-		self._local_frame_stack.append(self._local_frame)
-		self._tmp_frame = Frame()
+		self._tmp_frame = Frame.UNDEFINED
 
 	def POPFRAME(self):
-		if not self._local_frame_stack:
+		stack = self._local_frame_stack
+		if not stack:
 			raise UndefinedFrameError()
-		self._local_frame_stack.pop(-1)
 
-	def DEFVAR(self):
-		frame, var_name = self.__resolve_var(self._instr_args[0])
-		try:
-			frame.define_variable(var_name)
-		except InterpreterError:
-			raise
+		self._tmp_frame = stack.pop(-1)
+		self._local_frame = stack[-1] if stack else Frame.UNDEFINED
+
+	def DEFVAR(self, var):
+		frame, var_name = self.__resolve_var(var)
+		frame.define_variable(var_name)
 		
-	def CALL(self):
+	def CALL(self, label):
 		# Save the current instruction index
 		self._call_stack.append(self._instr_index)
 
-		try:
-			self.__label_jump()
-		except InterpreterError:
-			raise
+		self.__label_jump(label)
 
 	def RETURN(self):
 		if not self._call_stack:
@@ -160,492 +486,585 @@ class Interpreter:
 
 		self._instr_index = self._call_stack.pop(-1) 
 
-	def PUSHS(self):
-		try:
-			value = self.__get_arg_value(self._instr_args[0])
-		except InterpreterError:
-			raise
+	def PUSHS(self, symb):
+		value = self.__get_arg_value(symb)
+
+		if value.__class__ is StringBuffer:
+			value = value.freeze()
 
 		self._data_stack.append(value) 
 
-	def POPS(self):
-		try:
-			value = self._data_stack.pop(-1)
-			self.__write_var(self._instr_args[0], value)
-		except InterpreterError:
-			raise
-		except Exception:
+	def POPS(self, var):
+		if not self._data_stack:
 			raise ValueMissingError("data stack value")
 
-	def ADD(self):
-		try:
-			new_value = self.__arithmetic_calc("+")
-			self.__write_var(self._instr_args[0], new_value)
-		except InterpreterError:
-			raise
+		self.__write_var(var, self._data_stack.pop(-1))
 
-	def SUB(self):
-		try:
-			new_value = self.__arithmetic_calc("-")
-			self.__write_var(self._instr_args[0], new_value)
-		except InterpreterError:
-			raise
+	def ADD(self, var, symb1, symb2):
+		new_value = self.__arithmetic_calc(add, symb1, symb2)
+		self.__write_var(var, new_value)
 
-	def MUL(self):
-		try:
-			new_value = self.__arithmetic_calc("*")
-			self.__write_var(self._instr_args[0], new_value)
-		except InterpreterError:
-			raise
+	def SUB(self, var, symb1, symb2):
+		new_value = self.__arithmetic_calc(sub, symb1, symb2)
+		self.__write_var(var, new_value)
 
-	def IDIV(self):
-		try:
-			new_value = self.__arithmetic_calc("//")
-			self.__write_var(self._instr_args[0], new_value)
-		except InterpreterError:
-			raise
+	def MUL(self, var, symb1, symb2):
+		new_value = self.__arithmetic_calc(mul, symb1, symb2)
+		self.__write_var(var, new_value)
 
-	def LT(self):
-		try:
-			new_value = self.__comparation_calc("<")
-			self.__write_var(self._instr_args[0], new_value)
-		except InterpreterError:
-			raise
+	def IDIV(self, var, symb1, symb2):
+		new_value = self.__arithmetic_calc(floordiv, symb1, symb2)
+		self.__write_var(var, new_value)
 
-	def GT(self):
-		try:
-			new_value = self.__comparation_calc(">")
-			self.__write_var(self._instr_args[0], new_value)
-		except InterpreterError:
-			raise
+	def LT(self, var, symb1, symb2):
+		new_value = self.__comparation_calc(lt, symb1, symb2)
+		self.__write_var(var, new_value)
 
-	def EQ(self):
-		try:
-			new_value = self.__comparation_calc("=")
-			self.__write_var(self._instr_args[0], new_value)
-		except InterpreterError:
-			raise
+	def GT(self, var, symb1, symb2):
+		new_value = self.__comparation_calc(gt, symb1, symb2)
+		self.__write_var(var, new_value)
 
-	def AND(self):
-		try:
-			new_value = self.__logic_calc("&")
-			self.__write_var(self._instr_args[0], new_value)
-		except InterpreterError:
-			raise
+	def EQ(self, var, symb1, symb2):
+		new_value = self.__comparation_calc(eq, symb1, symb2)
+		self.__write_var(var, new_value)
 
-	def OR(self):
-		try:
-			new_value = self.__logic_calc("|")
-			self.__write_var(self._instr_args[0], new_value)
-		except InterpreterError:
-			raise
+	def AND(self, var, symb1, symb2):
+		new_value = self.__logic_calc(and_, symb1, symb2)
+		self.__write_var(var, new_value)
 
-	def NOT(self):
-		try:
-			new_value = self.__logic_calc("^")
-			self.__write_var(self._instr_args[0], new_value)
-		except InterpreterError:
-			raise
+	def OR(self, var, symb1, symb2):
+		new_value = self.__logic_calc(or_, symb1, symb2)
+		self.__write_var(var, new_value)
 
-	def INT2CHAR(self):
-		int_arg = self.__get_arg_value(self._instr_args[1])
+	def NOT(self, var, symb):
+		new_value = self.__logic_calc(not_, symb)
+		self.__write_var(var, new_value)
+
+	def INT2CHAR(self, var, symb):
+		int_arg = self.__get_arg_value(symb)
 		
-		if int_arg[0] != "int":
+		if int_arg.type != Type.INT:
 			raise InvalidOperandError("has to be a type of integer")
 		
 		try:
-			char = chr(int_arg[1])
-			self.__write_var(self._instr_args[0], ("string", char))
-		except InterpreterError:
-			raise
-		except Exception:
+			char = chr(int_arg.value)
+		except (ValueError, OverflowError):
 			raise StringOperationError("value can not be converted into a character")
 
-	def STRI2INT(self):
-		string_arg = self.__get_arg_value(self._instr_args[1])
-		position_arg = self.__get_arg_value(self._instr_args[2])
+		self.__write_var(var, Value(Type.STRING, char))
 
-		if string_arg[0] != "string":
+	def STRI2INT(self, var, symb1, symb2):
+		string_arg = self.__get_arg_value(symb1)
+		position_arg = self.__get_arg_value(symb2)
+
+		if string_arg.type != Type.STRING:
 			raise InvalidOperandError("has to be a type of string")
-		if position_arg[0] != "int":
+		if position_arg.type != Type.INT:
 			raise InvalidOperandError("has to be a type of integer")
 
-		index = position_arg[1]
-		string_list = list(string_arg[1]) 
+		index = position_arg.value
 
 		try:
-			value = ord(string_list[index])
-			self.__write_var(self._instr_args[0], ("int", value))
-		except InterpreterError:
-			raise
-		except Exception:
-			raise StringOperationError("index '{}' out of range".format(position_arg))
+			value = ord(string_arg.chars[index])
+		except IndexError:
+			raise StringOperationError("index '{}' out of range".format(index))
+
+		self.__write_var(var, Value(Type.INT, value))
+
+	def READ(self, var, type_arg):
+		input_type = type_arg
 
-	def READ(self):
-		input_type = self.__get_arg_value(self._instr_args[1])[1]
-		pattern = Constant.TYPE_VALUE_REGEX[input_type]
+		# A prompt written before has to be seen before the program waits
+		if self._input.interactive:
+			self._output.flush()
 		
-		value = input()
+		value = self._input.readline()
+		if value is None:
+			value = ""
 
 		if input_type == "int":
 			try:
 				value = int(value)
-			except Exception:
+			except ValueError:
 				value = 0	
 		elif input_type == "string":
-			if not re.match(pattern, value):
-				value = ""				
+			# Printable ASCII without backslashes and trailing space is always
+			# a valid string, only the other values need the full check
+			if not (value.isascii() and value.isprintable()
+					and "\\" not in value and value[-1:] != " "):
+				from src.strings import String
+
+				if String.decode(value) is None:
+					value = ""				
 		elif input_type == "bool":
-			value = value.lower()
-			if not re.match(pattern, value):
-				value = "false"
+			value = value.lower() == "true"
 
-		try:
-			self.__write_var(self._instr_args[0], (input_type, value))
-		except InterpreterError:
-			raise		 
+		self.__write_var(var, Value(Type.FROM_NAME[input_type], value))
+
+	def WRITE(self, symb):
+		value = self.__get_arg_value(symb)
 
-	def WRITE(self):
-		arg_val = self.__get_arg_value(self._instr_args[0])
-		print(arg_val[1], end='')
+		if value.type == Type.BOOL:
+			self._output.write("true" if value.value else "false")
+		else:
+			self._output.write(str(value.value))
 		
-	def CONCAT(self):
-		string1 = self.__get_arg_value(self._instr_args[1])
-		string2 = self.__get_arg_value(self._instr_args[2])
+	def CONCAT(self, var, symb1, symb2):
+		string1 = self.__get_arg_value(symb1)
+		string2 = self.__get_arg_value(symb2)
 
-		if string1[0] != "string":
+		if string1.type != Type.STRING:
 			raise InvalidOperandError("types have to be strings")
-		if string1[0] != string2[0]:
+		if string1.type != string2.type:
 			raise InvalidOperandError("types have to match")
 
-		new_string = string1[1] + string2[1]
+		# Appending to the same variable extends its buffer in place
+		if symb1 == var:
+			if string1.__class__ is StringBuffer:
+				string1.append(string2.value)
+				return
 
-		try:
-			self.__write_var(self._instr_args[0], ("string", new_string))
-		except InterpreterError:
-			raise
+			new_string = StringBuffer(string1.value)
+			new_string.append(string2.value)
+		else:
+			new_string = Value(Type.STRING, string1.value + string2.value)
+
+		self.__write_var(var, new_string)
 
-	def STRLEN(self):
-		string = self.__get_arg_value(self._instr_args[1])
+	def STRLEN(self, var, symb):
+		string = self.__get_arg_value(symb)
 
-		if string[0] != "string":
+		if string.type != Type.STRING:
 			raise InvalidOperandError("type has to be string")
 
-		string_len = len(string[1])
+		string_len = len(string.chars)
 
-		try:
-			self.__write_var(self._instr_args[0], ("int", string_len))
-		except InterpreterError:
-			raise
+		self.__write_var(var, Value(Type.INT, string_len))
 
-	def GETCHAR(self):
-		string_arg = self.__get_arg_value(self._instr_args[1])
-		position_arg = self.__get_arg_value(self._instr_args[2])
+	def GETCHAR(self, var, symb1, symb2):
+		string_arg = self.__get_arg_value(symb1)
+		position_arg = self.__get_arg_value(symb2)
 
-		if string_arg[0] != "string":
+		if string_arg.type != Type.STRING:
 			raise InvalidOperandError("has to be a type of string")
-		if position_arg[0] != "int":
+		if position_arg.type != Type.INT:
 			raise InvalidOperandError("has to be a type of integer")
 
-		index = position_arg[1]
-		string_list = list(string_arg[1])
+		index = position_arg.value
 
 		try:
-			value = string_list[index] 
-			self.__write_var(self._instr_args[0], ("string", value))
-		except InterpreterError:
-			raise
-		except Exception:
-			raise StringOperationError("index '{}' out of range".format(position_arg))
+			value = string_arg.chars[index]
+		except IndexError:
+			raise StringOperationError("index '{}' out of range".format(index))
+
+		self.__write_var(var, Value(Type.STRING, value))
 
-	def SETCHAR(self):
-		old_string_arg = self.__get_arg_value(self._instr_args[0])
-		index_arg = self.__get_arg_value(self._instr_args[1])
-		char_arg = self.__get_arg_value(self._instr_args[2])
+	def SETCHAR(self, var, symb1, symb2):
+		old_string_arg = self.__get_arg_value(var)
+		index_arg = self.__get_arg_value(symb1)
+		char_arg = self.__get_arg_value(symb2)
 
-		if old_string_arg[0] != "string":
+		if old_string_arg.type != Type.STRING:
 			raise InvalidOperandError("has to be a type of string")
-		if index_arg[0] != "int":
+		if index_arg.type != Type.INT:
 			raise InvalidOperandError("has to be a type of integer")
-		if char_arg[0] != "string":
+		if char_arg.type != Type.STRING:
 			raise InvalidOperandError("has to be a type of string")
 
-		try:
-			old_string_list = list(old_string_arg[1])
-			replace_char = list(char_arg[1])[0]
-			index = index_arg[1]
-
-			old_string_list[index] = replace_char
-			new_string = "".join(old_string_list)
-
-			self.__write_var(self._instr_args[0], ("string", new_string))
+		# The variable keeps a buffer edited in place by next SETCHARs
+		if old_string_arg.__class__ is StringBuffer:
+			new_string = old_string_arg
+		else:
+			new_string = StringBuffer(old_string_arg.value)
 
-		except InterpreterError:
-			raise
-		except Exception:
+		try:
+			new_string.set_char(index_arg.value, char_arg.value[0])
+		except IndexError:
 			raise StringOperationError("index out of range")
 
-	def TYPE(self):
-		symb_arg = self.__get_arg_value(self._instr_args[1])
+		if new_string is not old_string_arg:
+			self.__write_var(var, new_string)
 
-		try:
-			self.__write_var(self._instr_args[0], ("string", symb_arg[0]))
-		except InterpreterError:
-			raise
+	def TYPE(self, var, symb):
+		symb_arg = self.__get_arg_value(symb)
+
+		self.__write_var(var, Value(Type.STRING, Type.NAMES[symb_arg.type]))
 		
-	def LABEL(self):
+	def LABEL(self, label):
 		pass
 
-	def JUMP(self):
-		try:
-			self.__label_jump()
-		except InterpreterError:
-			raise
+	def JUMP(self, label):
+		self.__label_jump(label)
 
-	def JUMPIFEQ(self):
-		value1 = self.__get_arg_value(self._instr_args[1])
-		value2 = self.__get_arg_value(self._instr_args[2])
+	def JUMPIFEQ(self, label, symb1, symb2):
+		value1 = self.__get_arg_value(symb1)
+		value2 = self.__get_arg_value(symb2)
 
-		if value1[0] != value2[0]:
+		if value1.type != value2.type:
 			raise InvalidOperandError("types have to match")
 
-		if value1[1] == value2[1]:
-			try:
-				self.__label_jump()
-			except InterpreterError:
-				raise
+		if value1.value == value2.value:
+			self.__label_jump(label)
 
-	def JUMPIFNEQ(self):
-		value1 = self.__get_arg_value(self._instr_args[1])
-		value2 = self.__get_arg_value(self._instr_args[2])
+	def JUMPIFNEQ(self, label, symb1, symb2):
+		value1 = self.__get_arg_value(symb1)
+		value2 = self.__get_arg_value(symb2)
 
-		if value1[0] != value2[0]:
+		if value1.type != value2.type:
 			raise InvalidOperandError("types have to match")
 
-		if value1[1] != value2[1]:
-			try:
-				self.__label_jump()
-			except InterpreterError:
-				raise
+		if value1.value != value2.value:
+			self.__label_jump(label)
 
-	def DPRINT(self):
+	def DPRINT(self, symb):
 		pass
 
 	def BREAK(self):
 		pass
 
+	# Superinstructions created by the optimizer. Each of them executes
+	# an instruction pair and moves the instruction head to the second
+	# instruction before executing it, so errors are reported on its order.
+
+	def LT_JUMPIF(self, var, symb1, symb2, label, expected):
+		self.__compare_jump(lt, var, symb1, symb2, label, expected)
+
+	def GT_JUMPIF(self, var, symb1, symb2, label, expected):
+		self.__compare_jump(gt, var, symb1, symb2, label, expected)
+
+	def EQ_JUMPIF(self, var, symb1, symb2, label, expected):
+		self.__compare_jump(eq, var, symb1, symb2, label, expected)
+
+	def ADD_JUMP(self, var, symb1, symb2, label):
+		self.__write_var(var, self.__arithmetic_calc(add, symb1, symb2))
+
+		self._instr_index += 1
+		self.__label_jump(label)
+
+	def PUSHS_POPS(self, symb, var):
+		value = self.__get_arg_value(symb)
+		if value.__class__ is StringBuffer:
+			value = value.freeze()
+
+		self._instr_index += 1
+		self.__write_var(var, value)
+
+	# Unchecked variants of instructions created by the optimizer if type
+	# inference proves types of their operands. They skip type checks,
+	# which would always pass, but keep all other checks.
+
+	def ADD_UNCHECKED(self, var, symb1, symb2):
+		value1 = self.__get_arg_value(symb1).value
+		value2 = self.__get_arg_value(symb2).value
+		self.__write_var(var, Value(Type.INT, value1 + value2))
+
+	def SUB_UNCHECKED(self, var, symb1, symb2):
+		value1 = self.__get_arg_value(symb1).value
+		value2 = self.__get_arg_value(symb2).value
+		self.__write_var(var, Value(Type.INT, value1 - value2))
 
-	def __get_arg_value(self, arg: tuple) -> tuple:
+	def MUL_UNCHECKED(self, var, symb1, symb2):
+		value1 = self.__get_arg_value(symb1).value
+		value2 = self.__get_arg_value(symb2).value
+		self.__write_var(var, Value(Type.INT, value1 * value2))
+
+	def IDIV_UNCHECKED(self, var, symb1, symb2):
+		value1 = self.__get_arg_value(symb1).value
+		value2 = self.__get_arg_value(symb2).value
+
+		try:
+			self.__write_var(var, Value(Type.INT, value1 // value2))
+		except ZeroDivisionError:
+			raise DivisionZeroError()
+
+	def LT_UNCHECKED(self, var, symb1, symb2):
+		result = self.__get_arg_value(symb1).value < self.__get_arg_value(symb2).value
+		self.__write_var(var, Value.TRUE if result else Value.FALSE)
+
+	def GT_UNCHECKED(self, var, symb1, symb2):
+		result = self.__get_arg_value(symb1).value > self.__get_arg_value(symb2).value
+		self.__write_var(var, Value.TRUE if result else Value.FALSE)
+
+	def EQ_UNCHECKED(self, var, symb1, symb2):
+		result = self.__get_arg_value(symb1).value == self.__get_arg_value(symb2).value
+		self.__write_var(var, Value.TRUE if result else Value.FALSE)
+
+	def CONCAT_UNCHECKED(self, var, symb1, symb2):
+		string1 = self.__get_arg_value(symb1)
+		string2 = self.__get_arg_value(symb2)
+
+		if symb1 == var:
+			if string1.__class__ is StringBuffer:
+				string1.append(string2.value)
+				return
+
+			new_string = StringBuffer(string1.value)
+			new_string.append(string2.value)
+		else:
+			new_string = Value(Type.STRING, string1.value + string2.value)
+
+		self.__write_var(var, new_string)
+
+	def STRLEN_UNCHECKED(self, var, symb):
+		self.__write_var(var, Value(Type.INT, len(self.__get_arg_value(symb).chars)))
+
+	def GETCHAR_UNCHECKED(self, var, symb1, symb2):
+		chars = self.__get_arg_value(symb1).chars
+		index = self.__get_arg_value(symb2).value
+
+		try:
+			value = chars[index]
+		except IndexError:
+			raise StringOperationError("index '{}' out of range".format(index))
+
+		self.__write_var(var, Value(Type.STRING, value))
+
+	def JUMPIFEQ_UNCHECKED(self, label, symb1, symb2):
+		if self.__get_arg_value(symb1).value == self.__get_arg_value(symb2).value:
+			self.__label_jump(label)
+
+	def JUMPIFNEQ_UNCHECKED(self, label, symb1, symb2):
+		if self.__get_arg_value(symb1).value != self.__get_arg_value(symb2).value:
+			self.__label_jump(label)
+
+	def LT_JUMPIF_UNCHECKED(self, var, symb1, symb2, label, expected):
+		result = self.__get_arg_value(symb1).value < self.__get_arg_value(symb2).value
+		self.__store_jump(var, Value.TRUE if result else Value.FALSE, label, expected)
+
+	def GT_JUMPIF_UNCHECKED(self, var, symb1, symb2, label, expected):
+		result = self.__get_arg_value(symb1).value > self.__get_arg_value(symb2).value
+		self.__store_jump(var, Value.TRUE if result else Value.FALSE, label, expected)
+
+	def EQ_JUMPIF_UNCHECKED(self, var, symb1, symb2, label, expected):
+		result = self.__get_arg_value(symb1).value == self.__get_arg_value(symb2).value
+		self.__store_jump(var, Value.TRUE if result else Value.FALSE, label, expected)
+
+	def ADD_JUMP_UNCHECKED(self, var, symb1, symb2, label):
+		value1 = self.__get_arg_value(symb1).value
+		value2 = self.__get_arg_value(symb2).value
+		self.__write_var(var, Value(Type.INT, value1 + value2))
+
+		self._instr_index += 1
+		self.__label_jump(label)
+
+
+	def __get_arg_value(self, arg: object) -> Value:
 		"""Extracts and returns value of an argument
 		
 		Arguments:
-			arg {tuple} -- argument
+			arg {object} -- compiled argument, a constant value or a variable
 		
 		Returns:
-			tuple -- argument's value
+			Value -- argument's value
 		"""
 
-		if arg[0] == "var":
-			return self.__read_var(arg)
-		else:
+		if arg.__class__ is Value:
 			return arg
+		else:
+			return self.__read_var(arg)
 
-	def __write_var(self, var_arg: tuple, value: tuple):
+	def __write_var(self, var_arg: tuple, value: Value):
 		"""Writes value to a given variable
 		
 		Arguments:
-			var_arg {tuple} -- variable argument
-			value {tuple} -- value to be stored
+			var_arg {tuple} -- variable argument (frame type, key)
+			value {Value} -- value to be stored
 		"""
 
-		frame, var_name = self.__resolve_var(var_arg)
-		try:
-			frame.assign_value(var_name, value)
-		except InterpreterError:
-			raise
+		frame_type, key = var_arg
+
+		if frame_type == Constant.GF:
+			self._global_frame.assign_value(key, value)
+		elif frame_type == Constant.LF:
+			self._local_frame.assign_value(key, value)
+		else:
+			self._tmp_frame.assign_value(key, value)
 
-	def __read_var(self, var_arg: tuple) -> tuple:
+	def __read_var(self, var_arg: tuple) -> Value:
 		"""Reads value from a variable
 		
 		Arguments:
-			var_arg {tuple} -- variable argument
+			var_arg {tuple} -- variable argument (frame type, key)
 		
 		Returns:
-			tuple -- variable's value
+			Value -- variable's value
 		"""
 
-		frame, var_name = self.__resolve_var(var_arg)
-		try:
-			return frame.get_value(var_name)
-		except InterpreterError:
-			raise
+		frame_type, key = var_arg
+
+		if frame_type == Constant.GF:
+			return self._global_frame.get_value(key)
+		elif frame_type == Constant.LF:
+			return self._local_frame.get_value(key)
+		else:
+			return self._tmp_frame.get_value(key)
 
 	def __resolve_var(self, var_arg: tuple) -> tuple:
-		"""Resolves variable's frame and name
+		"""Resolves variable's frame and key
 		
 		Arguments:
-			var_arg {tuple} -- variable argument
+			var_arg {tuple} -- variable argument (frame type, slot id)
 		
 		Returns:
-			tuple -- frame object and variable name
+			tuple -- frame object and variable slot id
 		"""
 
-		var = var_arg[1]
-		frame_type, var_name = var.split('@')
-		frame = self.__select_frame(frame_type)
+		frame_type, key = var_arg
 		
-		return (frame, var_name)
+		return (self.__select_frame(frame_type), key)
 
-	def __select_frame(self, frame_type: str) -> object:
-		"""Selects frame based on a given frame type string
+	def __select_frame(self, frame_type: int) -> object:
+		"""Selects frame based on a given frame type
 		
 		Arguments:
-			frame_type {str} -- type of frame as a string
+			frame_type {int} -- type of frame (Constant.GF, LF or TF)
 		
 		Raises:
 			ValueError -- invalid frame type
 		
 		Returns:
-			object -- frame
+			object -- frame, Frame.UNDEFINED if it does not exist
 		"""
 
-		if frame_type == "GF":
+		if frame_type == Constant.GF:
 			return self._global_frame
-		elif frame_type == "LF":
+		elif frame_type == Constant.LF:
 			return self._local_frame
-		elif frame_type == "TF":
+		elif frame_type == Constant.TF:
 			return self._tmp_frame
 		else:
 			raise ValueError("Unknown frame '{}'".format(frame_type))
 
-	def __arithmetic_calc(self, operator: str) -> tuple:
+	def __arithmetic_calc(self, operator: object, symb1: object, symb2: object) -> Value:
 		"""Performs an arithmetical operation and returns result
 		
 		Arguments:
-			operator {str} -- operator sign
+			operator {object} -- operator function
+			symb1 {object} -- first operand
+			symb2 {object} -- second operand
 		
 		Raises:
 			InvalidOperandError -- Invalid operand type(s)
 			DivisionZeroError -- An attempt to division by zero
-			ValueError -- Invalid operator
 		
 		Returns:
-			tuple -- result (type, value)
+			Value -- result
 		"""
 
-		value1 = self.__get_arg_value(self._instr_args[1])
-		value2 = self.__get_arg_value(self._instr_args[2])
+		value1 = self.__get_arg_value(symb1)
+		value2 = self.__get_arg_value(symb2)
 
-		if value1[0] != "int":
+		if value1.type != Type.INT:
 			raise InvalidOperandError("types have to be integers")
-		if value1[0] != value2[0]:
+		if value1.type != value2.type:
 			raise InvalidOperandError("types have to match")
 
-		if operator == "+":
-			result = value1[1] + value2[1]
-		elif operator == "-":
-			result = value1[1] - value2[1]
-		elif operator == "*":
-			result = value1[1] * value2[1]
-		elif operator == "//":
-			try:			
-				result = value1[1] // value2[1]
-			except ZeroDivisionError:
-				raise DivisionZeroError()
-		else:
-			raise ValueError("invalid arithmetic operation")
-
-		return (value1[0], result)
+		try:
+			return Value(Type.INT, operator(value1.value, value2.value))
+		except ZeroDivisionError:
+			raise DivisionZeroError()
 	
-	def __comparation_calc(self, operator: str) -> tuple:
+	def __comparation_calc(self, operator: object, symb1: object, symb2: object) -> Value:
 		"""Performs and comparative operation and returns result
 		
 		Arguments:
-			operator {str} -- operator sign 
+			operator {object} -- operator function
+			symb1 {object} -- first operand
+			symb2 {object} -- second operand
 		
 		Raises:
 			InvalidOperandError -- operand types have to match
-			ValueError -- invalid operations
 		
 		Returns:
-			tuple -- result (type, value)
+			Value -- result
 		"""
 
-		value1 = self.__get_arg_value(self._instr_args[1])
-		value2 = self.__get_arg_value(self._instr_args[2])
+		value1 = self.__get_arg_value(symb1)
+		value2 = self.__get_arg_value(symb2)
 
-		if value1[0] != value2[0]:
+		if value1.type != value2.type:
 			raise InvalidOperandError("types have to match")
 
-		if operator == "<":
-			result = value1[1] < value2[1]
-		elif operator == ">":	
-			result = value1[1] > value2[1]
-		elif operator == "=":	
-			result = value1[1] == value2[1]
-		else:
-			raise ValueError("invalid comparation operation")
-
-		result_value = "true" if result else "false"
+		return Value.TRUE if operator(value1.value, value2.value) else Value.FALSE
 
-		return ("bool", result_value)
-
-	def __logic_calc(self, operator: str) -> tuple:
+	def __logic_calc(self, operator: object, symb1: object, symb2: object = None) -> Value:
 		"""Performs logical operation and returns result
 		
 		Arguments:
-			operator {str} -- operator sign
+			operator {object} -- operator function
+			symb1 {object} -- first operand
+			symb2 {object} -- second operand, None for unary operations
 		
 		Raises:
 			InvalidOperandError -- Invalid operand type(s)
-			ValueError -- invalid operator
 		
 		Returns:
-			tuple -- value (type, value)
+			Value -- result
 		"""
 
-		value1 = self.__get_arg_value(self._instr_args[1])
-		tmp_value1 = True if value1[1] == "true" else False
-		
-		value2 = None
-		tmp_value2 = None
-		
-		if len(self._instr_args) == 3:
-			value2 = self.__get_arg_value(self._instr_args[2])
-			tmp_value2 = True if value1[1] == "true" else False
+		value1 = self.__get_arg_value(symb1)
+
+		if symb2 is not None:
+			value2 = self.__get_arg_value(symb2)
 			
-			if value1[0] != value2[0]:
+			if value1.type != value2.type:
 				raise InvalidOperandError("types have to match")
 
-		if value1[0] != "bool":
+		if value1.type != Type.BOOL:
 			raise InvalidOperandError("types have to be booleans")
 
-		if operator == "&":
-			result = tmp_value1 & tmp_value2
-		elif operator == "|":
-			result = tmp_value1 | tmp_value2
-		elif operator == "^":
-			result = not tmp_value1
+		if symb2 is None:
+			result = operator(value1.value)
 		else:
-			raise ValueError("invalid logic operation")
+			result = operator(value1.value, value2.value)
+
+		return Value.TRUE if result else Value.FALSE
+
+	def __compare_jump(self, operator: object, var: tuple, symb1: object, symb2: object,
+					   label: str, expected: Value):
+		"""Stores result of a comparison and jumps if it matches the expected value
+
+		Arguments:
+			operator {object} -- operator function
+			var {tuple} -- variable argument for the result
+			symb1 {object} -- first operand
+			symb2 {object} -- second operand
+			label {str} -- label name
+			expected {Value} -- result on which the jump is taken
+		"""
+
+		self.__store_jump(var, self.__comparation_calc(operator, symb1, symb2), label, expected)
 
-		result_value = "true" if result else "false"
+	def __store_jump(self, var: tuple, result: Value, label: str, expected: Value):
+		"""Stores result of a comparison and jumps if it matches the expected value
 
-		return ("bool", result_value)
+		Arguments:
+			var {tuple} -- variable argument for the result
+			result {Value} -- comparison result
+			label {str} -- label name
+			expected {Value} -- result on which the jump is taken
+		"""
+
+		self.__write_var(var, result)
+
+		self._instr_index += 1
+		if result is expected:
+			self.__label_jump(label)
 
-	def __label_jump(self):
+	def __label_jump(self, label: str):
 		"""Sets the instruction head to the index of label given by an instruction
 		   argument 
 		
+		Arguments:
+			label {str} -- label name
+
 		Raises:
 			SemanticError -- label doesn't exist
 		"""
 
-		label = self._instr_args[0][1]
-		
 		try:
-			jump_order = self._jump_label_list[label]
-		except Exception:
+			jump_index = self._jump_label_list[label]
+		except KeyError:
 			raise SemanticError("undefined label '{}'".format(label))
 
-		self._instr_index = self._instr_order_list.index(jump_order)
+		self._instr_index = jump_index
@@ -0,0 +1,642 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		jit.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Loop compiler translating hot loops into Python functions
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from src.constants import Constant
+from src.value import Type, Value
+from src.optimizer import Optimizer
+from src.debug import Debug
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class LoopNotCompiled(Exception):
+	"""Loop contains an instruction or operand types the JIT does not support"""
+
+
+class JIT():
+	"""Loop compiler
+
+	A loop is the code between a LABEL and the last jump back to it. The
+	instruction following the label of every loop is wrapped by a counter,
+	once the loop is entered HOT_THRESHOLD times it is compiled into
+	a Python function which replaces the wrapped instruction.
+
+	Variables of the loop become local variables holding plain Python
+	values and instructions become Python expressions. The function is
+	specialized on types of the variables when it is compiled, a guard
+	checks these types on every entry and leaves the loop to the
+	interpreter if they differ. Changed variables are written back
+	to their frames whenever the function exits: by a jump out of the
+	loop, by falling through its end or before an instruction which
+	would fail, so the interpreter executes it and reports the error
+	on its order.
+
+	Loops containing other instructions than data moves, data stack,
+	arithmetic, relational, logical and string instructions, WRITE and
+	jumps are not compiled, neither are loops with nested loops or operand
+	types on which an instruction fails.
+	"""
+
+	HOT_THRESHOLD = 50
+
+	# Compiled loop is dropped after this many entries with changed types
+	MAX_GUARD_FAILURES = 100
+
+	# Superinstructions are compiled as their first instruction,
+	# the second one stays in place: (opcode, number of arguments)
+	FUSED = {
+		'LT_JUMPIF': ('LT', 3), 'GT_JUMPIF': ('GT', 3), 'EQ_JUMPIF': ('EQ', 3),
+		'ADD_JUMP': ('ADD', 3), 'PUSHS_POPS': ('PUSHS', 1),
+	}
+	ARITHMETIC = {'ADD': "+", 'SUB': "-", 'MUL': "*"}
+	RELATIONAL = {'LT': "<", 'GT': ">", 'EQ': "=="}
+	LOGICAL = {'AND': "and", 'OR': "or"}
+	JUMPS = ('JUMP', 'JUMPIFEQ', 'JUMPIFNEQ')
+
+	FRAME_NAMES = {Constant.GF: "gf", Constant.LF: "lf", Constant.TF: "tf"}
+
+	def __init__(self, interpreter: object, program: list, opcode_list: list,
+				 order_list: list, jump_label_list: dict):
+		self._interpreter = interpreter
+		self._program = program
+		self._handlers = list(program)
+		self._opcode_list = opcode_list
+		self._order_list = order_list
+		self._jump_label_list = jump_label_list
+		self._compiled_count = 0
+
+	def install(self):
+		"""Wraps the first instruction of every loop by an entry counter
+		"""
+
+		loop_ends = dict()
+		for index in range(len(self._opcode_list)):
+			opcode, args = self.instruction(index)
+			if opcode not in JIT.JUMPS or args[0] not in self._jump_label_list:
+				continue
+
+			label_index = self._jump_label_list[args[0]]
+			if label_index < index:
+				loop_ends[label_index] = index
+
+		for label_index, end_index in loop_ends.items():
+			start = label_index + 1
+			self._program[start] = self.__counter(start, end_index)
+
+	def __counter(self, start: int, end: int) -> object:
+		"""Creates an entry counter of a loop
+
+		Arguments:
+			start {int} -- index of the first loop instruction
+			end {int} -- index of the last jump back to the loop label
+
+		Returns:
+			object -- callable replacing the first loop instruction
+		"""
+
+		handler = self._handlers[start]
+		entries = 0
+
+		def count():
+			nonlocal entries
+
+			entries += 1
+			if entries == JIT.HOT_THRESHOLD:
+				self._program[start] = self.__compile(start, end)
+
+			handler()
+
+		return count
+
+	def __compile(self, start: int, end: int) -> object:
+		"""Compiles a loop, specialized on current types of its variables
+
+		Arguments:
+			start {int} -- index of the first loop instruction
+			end {int} -- index of the last jump back to the loop label
+
+		Returns:
+			object -- callable executing the loop, the original instruction
+					  handler if the loop can not be compiled
+		"""
+
+		handler = self._handlers[start]
+
+		try:
+			source = LoopSource(self, start, end).generate()
+		except LoopNotCompiled as e:
+			Debug.printd("JIT -> loop at instruction", self._order_list[start],
+						 "not compiled:", e, category=Debug.JIT)
+			return handler
+
+		Debug.printd("JIT -> compiled loop at instruction", self._order_list[start],
+					 category=Debug.JIT)
+		Debug.printd(source, category=Debug.JIT)
+
+		namespace = {"Value": Value}
+		exec(compile(source, "<loop {}>".format(self._order_list[start]), "exec"), namespace)
+		self._compiled_count += 1
+
+		return self.__loop_runner(start, handler, namespace["loop"])
+
+	def __loop_runner(self, start: int, handler: object, loop: object) -> object:
+		"""Creates callable running a compiled loop in place of its first instruction
+
+		Arguments:
+			start {int} -- index of the first loop instruction
+			handler {object} -- original handler of the instruction
+			loop {object} -- compiled loop function
+
+		Returns:
+			object -- loop runner
+		"""
+
+		interpreter = self._interpreter
+		guard_failures = 0
+
+		def run():
+			nonlocal guard_failures
+
+			resume_index = loop(interpreter._global_frame, interpreter._local_frame,
+								interpreter._tmp_frame, interpreter._data_stack,
+								interpreter._output.write)
+
+			if resume_index is None:
+				guard_failures += 1
+				if guard_failures == JIT.MAX_GUARD_FAILURES:
+					self._program[start] = handler
+				handler()
+			elif resume_index == start:
+				# Loop left before its first instruction, which is this runner
+				handler()
+			else:
+				# Interpreter loop moves to the next instruction
+				interpreter._instr_index = resume_index - 1
+
+		return run
+
+	def instruction(self, index: int) -> tuple:
+		"""Returns opcode and compiled operands of an instruction
+
+		Superinstructions and unchecked variants are returned as the
+		original instruction.
+
+		Arguments:
+			index {int} -- instruction index
+
+		Returns:
+			tuple -- (opcode, operands)
+		"""
+
+		opcode = self._opcode_list[index]
+		args = getattr(self._handlers[index], "args", ())
+
+		if opcode.endswith(Optimizer.UNCHECKED_SUFFIX):
+			opcode = opcode[:-len(Optimizer.UNCHECKED_SUFFIX)]
+		if opcode in JIT.FUSED:
+			opcode, arg_count = JIT.FUSED[opcode]
+			args = args[:arg_count]
+
+		return (opcode, args)
+
+	def frame(self, frame_type: int) -> object:
+		"""Returns current frame of a given type
+
+		Arguments:
+			frame_type {int} -- type of frame (Constant.GF, LF or TF)
+
+		Returns:
+			object -- frame
+		"""
+
+		return {
+			Constant.GF: self._interpreter._global_frame,
+			Constant.LF: self._interpreter._local_frame,
+			Constant.TF: self._interpreter._tmp_frame,
+		}[frame_type]
+
+	@property
+	def jump_label_list(self):
+		return self._jump_label_list
+
+	@property
+	def compiled_count(self):
+		return self._compiled_count
+
+
+class LoopSource():
+	"""Python source of a compiled loop
+
+	The loop is split into blocks starting at labels and after jumps.
+	Jumps inside a loop only go forward, except jumps back to its start,
+	so block number b is executed only if no jump skipped it, i.e. if
+	the target block number stored in b is not greater. Generated
+	function returns the index of the instruction to be executed next,
+	or None if the types of variables do not match.
+	"""
+
+	# Exits are generated once all variables written by the loop are known
+	EXIT_MARK = "#exit "
+
+	def __init__(self, jit: JIT, start: int, end: int):
+		self._jit = jit
+		self._start = start
+		self._end = end
+		self._variables = dict()
+		self._written = set()
+		self._blocks = dict()
+		self._lines = list()
+
+	def generate(self) -> str:
+		"""Generates source of the loop function
+
+		Raises:
+			LoopNotCompiled -- loop can not be compiled
+
+		Returns:
+			str -- source defining function loop(gf, lf, tf, stack, write)
+		"""
+
+		self.__find_blocks()
+
+		body = list()
+		for index in range(self._start, self._end + 1):
+			if index in self._blocks and len(self._blocks) > 1:
+				body.append((1, "if b <= {}:".format(self._blocks[index])))
+			indent = 2 if len(self._blocks) > 1 else 1
+
+			for line in self.__instruction(index):
+				body.append((indent, line))
+
+		# Falling through the last instruction leaves the loop
+		body += [(1, line) for line in self.__exit(self._end + 1)]
+
+		lines = ["def loop(gf, lf, tf, stack, write):"]
+		lines += ["\t" + line for line in self.__entry()]
+		if len(self._blocks) > 1:
+			lines.append("\tb = 0")
+		lines.append("\twhile True:")
+
+		for indent, line in body:
+			prefix = "\t" * (indent + 1)
+			statement = line.lstrip("\t")
+
+			if statement.startswith(LoopSource.EXIT_MARK):
+				prefix += line[:len(line) - len(statement)]
+				resume_index = int(statement[len(LoopSource.EXIT_MARK):])
+				lines += [prefix + exit_line for exit_line in self.__write_back(resume_index)]
+			else:
+				lines.append(prefix + line)
+
+		return "\n".join(lines) + "\n"
+
+	def __find_blocks(self):
+		"""Numbers blocks of the loop and checks its jumps
+
+		Raises:
+			LoopNotCompiled -- a jump goes back, but not to the loop start
+		"""
+
+		starts = {self._start}
+		for index in range(self._start, self._end + 1):
+			opcode, args = self._jit.instruction(index)
+			if opcode not in JIT.JUMPS:
+				continue
+
+			target = self.__jump_target(args[0])
+			if target == self._start:
+				pass
+			elif self._start < target <= self._end:
+				if target < index:
+					raise LoopNotCompiled("nested loop")
+				starts.add(target)
+			starts.add(index + 1)
+
+		for number, index in enumerate(sorted(starts)):
+			self._blocks[index] = number
+
+	def __jump_target(self, label: str) -> int:
+		"""Returns index of the instruction executed after a jump to a label
+
+		Arguments:
+			label {str} -- label name
+
+		Raises:
+			LoopNotCompiled -- undefined label, left to the interpreter
+
+		Returns:
+			int -- instruction index
+		"""
+
+		if label not in self._jit.jump_label_list:
+			raise LoopNotCompiled("undefined label '{}'".format(label))
+
+		return self._jit.jump_label_list[label] + 1
+
+	def __entry(self) -> list:
+		"""Generates loading of variables and guards of their types
+
+		Returns:
+			list -- lines of the function entry
+		"""
+
+		lines = list()
+		for frame_type in (Constant.LF, Constant.TF):
+			if any(var[0] == frame_type for var in self._variables):
+				lines.append("if not {}.defined: return None".format(JIT.FRAME_NAMES[frame_type]))
+		for frame_type in JIT.FRAME_NAMES:
+			if any(var[0] == frame_type for var in self._variables):
+				lines.append("{0}s = {0}.slots".format(JIT.FRAME_NAMES[frame_type]))
+
+		for (frame_type, slot), (name, var_type) in self._variables.items():
+			lines.append("{} = {}s[{}]".format(name, JIT.FRAME_NAMES[frame_type], slot))
+			lines.append("if {0} is None or {0}.type != {1}: return None".format(name, var_type))
+			lines.append("{0} = {0}.value".format(name))
+
+		return lines
+
+	def __exit(self, resume_index: int) -> list:
+		"""Generates leaving the loop, expanded by generate()
+
+		Arguments:
+			resume_index {int} -- index of the instruction executed next
+
+		Returns:
+			list -- lines of the exit
+		"""
+
+		return [LoopSource.EXIT_MARK + str(resume_index)]
+
+	def __write_back(self, resume_index: int) -> list:
+		"""Generates writing variables back and leaving the loop
+
+		Arguments:
+			resume_index {int} -- index of the instruction executed next
+
+		Returns:
+			list -- lines of the exit
+		"""
+
+		lines = list()
+		for var in sorted(self._written):
+			name, var_type = self._variables[var]
+			value = self.__value(var_type, name)
+			lines.append("{}s[{}] = {}".format(JIT.FRAME_NAMES[var[0]], var[1], value))
+
+		lines.append("return {}".format(resume_index))
+		return lines
+
+	def __value(self, value_type: int, expression: str) -> str:
+		"""Returns expression creating a Value of a plain Python value
+
+		Arguments:
+			value_type {int} -- value type
+			expression {str} -- plain value expression
+
+		Returns:
+			str -- Python expression
+		"""
+
+		if value_type == Type.BOOL:
+			return "Value.TRUE if {} else Value.FALSE".format(expression)
+
+		return "Value({}, {})".format(value_type, expression)
+
+	def __operand(self, arg: object, *types) -> str:
+		"""Returns expression of an operand and checks its type
+
+		Arguments:
+			arg {object} -- compiled operand, a constant value or a variable
+			types {int} -- allowed types
+
+		Raises:
+			LoopNotCompiled -- operand type is not allowed
+
+		Returns:
+			str -- Python expression
+		"""
+
+		if arg.__class__ is Value:
+			value_type, expression = arg.type, repr(arg.value)
+		else:
+			expression, value_type = self.__variable(arg)
+
+		if value_type not in types:
+			raise LoopNotCompiled("operand of type '{}'".format(Type.NAMES[value_type]))
+
+		return expression
+
+	def __variable(self, var: tuple) -> tuple:
+		"""Returns local variable of a frame variable
+
+		The variable type is the type of its current value.
+
+		Arguments:
+			var {tuple} -- variable (frame type, slot id)
+
+		Raises:
+			LoopNotCompiled -- variable is not defined or is uninitialized
+
+		Returns:
+			tuple -- (local variable name, type)
+		"""
+
+		if var not in self._variables:
+			frame = self._jit.frame(var[0])
+			value = frame.slots[var[1]] if frame.defined else None
+			if value is None or value.type == Type.NIL:
+				raise LoopNotCompiled("undefined or uninitialized variable")
+
+			self._variables[var] = ("v{}".format(len(self._variables)), value.type)
+
+		return self._variables[var]
+
+	def __store(self, var: tuple, value_type: int, expression: str) -> list:
+		"""Generates assignment to a variable which keeps its type
+
+		Arguments:
+			var {tuple} -- variable (frame type, slot id)
+			value_type {int} -- type of the assigned value
+			expression {str} -- assigned expression
+
+		Raises:
+			LoopNotCompiled -- variable would change its type
+
+		Returns:
+			list -- lines of the assignment
+		"""
+
+		name, var_type = self.__variable(var)
+		if var_type != value_type:
+			raise LoopNotCompiled("variable changes its type")
+
+		self._written.add(var)
+		return ["{} = {}".format(name, expression)]
+
+	def __bail_out(self, index: int, condition: str) -> list:
+		"""Generates leaving the loop before an instruction which would fail
+
+		Arguments:
+			index {int} -- instruction index
+			condition {str} -- failure condition
+
+		Returns:
+			list -- lines of the check
+		"""
+
+		return ["if {}:".format(condition)] + ["\t" + line for line in self.__exit(index)]
+
+	def __jump(self, label: str) -> list:
+		"""Generates a taken jump
+
+		Arguments:
+			label {str} -- label name
+
+		Returns:
+			list -- lines of the jump
+		"""
+
+		target = self.__jump_target(label)
+
+		if target == self._start:
+			return (["b = 0"] if len(self._blocks) > 1 else []) + ["continue"]
+		if self._start < target <= self._end:
+			return ["b = {}".format(self._blocks[target])]
+
+		return self.__exit(target)
+
+	def __instruction(self, index: int) -> list:
+		"""Generates source of an instruction
+
+		Arguments:
+			index {int} -- instruction index
+
+		Raises:
+			LoopNotCompiled -- instruction or its operand types are not supported
+
+		Returns:
+			list -- lines of the instruction
+		"""
+
+		opcode, args = self._jit.instruction(index)
+
+		if opcode == 'LABEL':
+			return ["pass"]
+
+		if opcode == 'JUMP':
+			return self.__jump(args[0])
+
+		if opcode in ('JUMPIFEQ', 'JUMPIFNEQ'):
+			left = self.__operand(args[1], Type.INT, Type.BOOL, Type.STRING)
+			right = self.__operand(args[2], self.__type(args[1]))
+			operator = "==" if opcode == 'JUMPIFEQ' else "!="
+			return (["if {} {} {}:".format(left, operator, right)]
+					+ ["\t" + line for line in self.__jump(args[0])])
+
+		if opcode == 'WRITE':
+			value_type = self.__type(args[0])
+			value = self.__operand(args[0], Type.INT, Type.BOOL, Type.STRING)
+			if value_type == Type.INT:
+				value = "str({})".format(value)
+			elif value_type == Type.BOOL:
+				value = "'true' if {} else 'false'".format(value)
+			return ["write({})".format(value)]
+
+		if opcode == 'PUSHS':
+			value_type = self.__type(args[0])
+			value = self.__operand(args[0], Type.INT, Type.BOOL, Type.STRING)
+			return ["stack.append({})".format(self.__value(value_type, value))]
+
+		if opcode == 'POPS':
+			name, var_type = self.__variable(args[0])
+			condition = "not stack or stack[-1].type != {}".format(var_type)
+			return (self.__bail_out(index, condition)
+					+ self.__store(args[0], var_type, "stack.pop().value"))
+
+		if opcode == 'MOVE':
+			value_type = self.__type(args[1])
+			value = self.__operand(args[1], Type.INT, Type.BOOL, Type.STRING)
+			return self.__store(args[0], value_type, value)
+
+		if opcode in JIT.ARITHMETIC:
+			expression = "{} {} {}".format(self.__operand(args[1], Type.INT), JIT.ARITHMETIC[opcode],
+											self.__operand(args[2], Type.INT))
+			return self.__store(args[0], Type.INT, expression)
+
+		if opcode == 'IDIV':
+			divisor = self.__operand(args[2], Type.INT)
+			expression = "{} // {}".format(self.__operand(args[1], Type.INT), divisor)
+			return (self.__bail_out(index, "{} == 0".format(divisor))
+					+ self.__store(args[0], Type.INT, expression))
+
+		if opcode in JIT.RELATIONAL:
+			value_type = self.__type(args[1])
+			expression = "{} {} {}".format(
+				self.__operand(args[1], Type.INT, Type.BOOL, Type.STRING),
+				JIT.RELATIONAL[opcode], self.__operand(args[2], value_type))
+			return self.__store(args[0], Type.BOOL, expression)
+
+		if opcode in JIT.LOGICAL:
+			expression = "{} {} {}".format(self.__operand(args[1], Type.BOOL), JIT.LOGICAL[opcode],
+											self.__operand(args[2], Type.BOOL))
+			return self.__store(args[0], Type.BOOL, expression)
+
+		if opcode == 'NOT':
+			return self.__store(args[0], Type.BOOL, "not {}".format(self.__operand(args[1], Type.BOOL)))
+
+		if opcode == 'CONCAT':
+			expression = "{} + {}".format(self.__operand(args[1], Type.STRING),
+										  self.__operand(args[2], Type.STRING))
+			return self.__store(args[0], Type.STRING, expression)
+
+		if opcode == 'STRLEN':
+			return self.__store(args[0], Type.INT, "len({})".format(self.__operand(args[1], Type.STRING)))
+
+		if opcode in ('GETCHAR', 'STRI2INT'):
+			string = self.__operand(args[1], Type.STRING)
+			position = self.__operand(args[2], Type.INT)
+			expression = "{}[{}]".format(string, position)
+			if opcode == 'STRI2INT':
+				expression = "ord({})".format(expression)
+
+			# Negative positions index from the end, as in the interpreter
+			condition = "not -len({0}) <= {1} < len({0})".format(string, position)
+			return (self.__bail_out(index, condition)
+					+ self.__store(args[0], Type.INT if opcode == 'STRI2INT' else Type.STRING, expression))
+
+		if opcode == 'INT2CHAR':
+			code = self.__operand(args[1], Type.INT)
+			return (self.__bail_out(index, "not 0 <= {} < 0x110000".format(code))
+					+ self.__store(args[0], Type.STRING, "chr({})".format(code)))
+
+		raise LoopNotCompiled("instruction {}".format(opcode))
+
+	def __type(self, arg: object) -> int:
+		"""Returns type of an operand
+
+		Arguments:
+			arg {object} -- compiled operand
+
+		Returns:
+			int -- value type
+		"""
+
+		if arg.__class__ is Value:
+			return arg.type
+
+		return self.__variable(arg)[1]
@@ -0,0 +1,80 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		limits.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Instruction count and wall clock limits of program execution
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from time import monotonic
+
+from src.exceptions import LimitExceededError
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class ExecutionLimits():
+	"""Execution limits
+
+	Stops programs which execute more than a given number of instructions
+	or run longer than a given number of seconds. Limits are checked in
+	batches of instructions, the interpreter loop only counts down to the
+	next check. The instruction limit is exact, the time limit may be
+	exceeded by the time of one batch.
+	"""
+
+	# Instructions executed between checks of the clock
+	CHECK_INTERVAL = 4096
+
+	def __init__(self, max_instructions: int = None, timeout: float = None):
+		self._max_instructions = max_instructions
+		self._timeout = timeout
+		self._remaining = max_instructions
+		self._deadline = None
+
+	def start(self):
+		"""Starts measuring the execution time
+		"""
+
+		if self._timeout is not None:
+			self._deadline = monotonic() + self._timeout
+
+	def countdown(self) -> int:
+		"""Returns number of instructions to execute before the next check
+
+		Returns:
+			int -- instruction count
+		"""
+
+		if self._remaining is not None:
+			return min(self._remaining, ExecutionLimits.CHECK_INTERVAL)
+
+		return ExecutionLimits.CHECK_INTERVAL
+
+	def check(self, executed: int):
+		"""Checks the limits
+
+		Arguments:
+			executed {int} -- instructions executed since the last check
+
+		Raises:
+			LimitExceededError -- a limit is exceeded
+		"""
+
+		if self._remaining is not None:
+			self._remaining -= executed
+			if self._remaining <= 0:
+				raise LimitExceededError("{} instructions".format(self._max_instructions))
+
+		if self._deadline is not None and monotonic() >= self._deadline:
+			raise LimitExceededError("timeout of {} s".format(self._timeout))
@@ -0,0 +1,363 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		optimizer.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Optimization passes over the parsed instruction list
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from operator import add, sub, mul, floordiv, lt, gt, eq, and_, or_, not_
+
+from src.value import Type, Value
+from src.inference import TypeInference
+from src.debug import Debug
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Optimizer():
+	"""Program optimizer
+
+	Rewrites the instruction list created by the parser before it is
+	compiled. Optimization level 0 keeps the program unchanged, level 1
+	fuses frequent instruction pairs into superinstructions, level 2
+	additionally folds constant expressions, removes unreachable
+	instructions and unreferenced labels and replaces instructions whose
+	operand types are proven by type inference with unchecked variants.
+	Level 3 keeps the program of level 2 and lets the interpreter compile
+	hot loops into Python functions at runtime (see src.jit).
+
+	A superinstruction replaces the first instruction of a pair and
+	executes both of them, the second instruction stays in place, so
+	instruction indices, jump labels and orders reported in error messages
+	do not change. Removed instructions leave gaps in the instruction
+	orders, remaining instructions keep their orders and jump labels are
+	resolved again.
+
+	Instructions are folded only if they can not fail, any runtime error
+	is left to be reported by the interpreter. An unchecked variant has
+	the opcode with the UNCHECKED_SUFFIX and skips only type checks which
+	always pass, other errors are still detected.
+	"""
+
+	DEFAULT_LEVEL = 1
+	JIT_LEVEL = 3
+	MAX_LEVEL = 3
+
+	# Operator functions of instructions computed on constant operands
+	ARITHMETIC = {'ADD': add, 'SUB': sub, 'MUL': mul, 'IDIV': floordiv}
+	RELATIONAL = {'LT': lt, 'GT': gt, 'EQ': eq}
+	LOGICAL = {'AND': and_, 'OR': or_, 'NOT': not_}
+
+	LITERAL_TYPES = ('int', 'bool', 'string')
+	JUMPS = ('JUMP', 'JUMPIFEQ', 'JUMPIFNEQ', 'CALL')
+	CONDITIONAL_JUMPS = ('JUMPIFEQ', 'JUMPIFNEQ')
+
+	FOLDABLE = (*ARITHMETIC, *RELATIONAL, *LOGICAL, *CONDITIONAL_JUMPS)
+
+	# Comparison followed by a conditional jump on its result
+	COMPARISONS = ('LT', 'GT', 'EQ')
+
+	SUPERINSTRUCTIONS = ('LT_JUMPIF', 'GT_JUMPIF', 'EQ_JUMPIF', 'ADD_JUMP', 'PUSHS_POPS')
+
+	UNCHECKED_SUFFIX = "_UNCHECKED"
+
+	def __init__(self, instruction_list: dict, jump_label_list: dict,
+				 level: int = DEFAULT_LEVEL):
+		self._instruction_list = instruction_list
+		self._jump_label_list = jump_label_list
+		self._level = level
+		self._folded_count = 0
+		self._removed_count = 0
+		self._fused_count = 0
+		self._unchecked_orders = set()
+
+	def run(self):
+		"""Executes optimization passes enabled by the optimization level
+		"""
+
+		if self._level >= 2:
+			self._instruction_list = dict(self._instruction_list)
+
+			self.__fold_constants()
+			self.__remove_unreachable()
+			self.__remove_unused_labels()
+			self.__resolve_jump_labels()
+
+			Debug.printd("Optimizer -> folded", self._folded_count, "and removed",
+						 self._removed_count, "instructions")
+
+			inference = TypeInference(self._instruction_list, self._jump_label_list)
+			inference.run()
+			self._unchecked_orders = inference.unchecked_orders
+
+		if self._level >= 1:
+			self.__fuse()
+
+		Debug.printd("Optimizer -> fused", self._fused_count, "instruction pairs")
+
+		self.__specialize()
+
+	def __specialize(self):
+		"""Replaces instructions with proven operand types by unchecked variants
+
+		A superinstruction is proven by its first instruction, the second
+		one is a conditional jump on a boolean result or an unconditional
+		jump, so all of its types are known too.
+		"""
+
+		for order in self._unchecked_orders:
+			opcode, args = self._instruction_list[order]
+			self._instruction_list[order] = (opcode + Optimizer.UNCHECKED_SUFFIX, args)
+
+	def __fold_constants(self):
+		"""Replaces operations on constant operands by their results
+
+		An operation storing its result into a variable becomes a MOVE
+		of the result. A conditional jump becomes an unconditional one
+		if it is always taken and is removed if it is never taken.
+		"""
+
+		for order, (opcode, args) in list(self._instruction_list.items()):
+			if opcode not in Optimizer.FOLDABLE:
+				continue
+
+			operands = args[1:]
+			if any(arg[0] not in Optimizer.LITERAL_TYPES for arg in operands):
+				continue
+
+			values = [Value.from_literal(*arg) for arg in operands]
+			result = self.__evaluate(opcode, values)
+			if result is None:
+				continue
+
+			self._folded_count += 1
+
+			if opcode in Optimizer.CONDITIONAL_JUMPS:
+				if result.value:
+					self._instruction_list[order] = ('JUMP', args[:1])
+				else:
+					del self._instruction_list[order]
+					self._removed_count += 1
+			else:
+				self._instruction_list[order] = ('MOVE', [args[0], self.__literal(result)])
+
+	def __evaluate(self, opcode: str, values: list) -> Value:
+		"""Computes result of an instruction on constant operands
+
+		Arguments:
+			opcode {str} -- instruction opcode
+			values {list} -- operand values
+
+		Returns:
+			Value -- result (jump condition of a conditional jump), None
+					 if the instruction would fail at runtime
+		"""
+
+		types = set(value.type for value in values)
+		if len(types) != 1:
+			return None
+
+		operands = [value.value for value in values]
+		value_type = types.pop()
+
+		if opcode in Optimizer.ARITHMETIC:
+			if value_type != Type.INT or (opcode == 'IDIV' and operands[1] == 0):
+				return None
+			return Value(Type.INT, Optimizer.ARITHMETIC[opcode](*operands))
+
+		if opcode in Optimizer.LOGICAL:
+			if value_type != Type.BOOL:
+				return None
+			result = Optimizer.LOGICAL[opcode](*operands)
+		elif opcode in Optimizer.RELATIONAL:
+			result = Optimizer.RELATIONAL[opcode](*operands)
+		else:
+			result = (operands[0] == operands[1]) == (opcode == 'JUMPIFEQ')
+
+		return Value.TRUE if result else Value.FALSE
+
+	def __literal(self, value: Value) -> tuple:
+		"""Converts value to an instruction argument
+
+		Arguments:
+			value {Value} -- constant value
+
+		Returns:
+			tuple -- literal argument (type, value)
+		"""
+
+		if value.type == Type.BOOL:
+			return ("bool", str(value))
+
+		return (Type.NAMES[value.type], value.value)
+
+	def __remove_unreachable(self):
+		"""Removes instructions not reachable from the program start
+
+		Walks the control flow graph of instructions: an instruction
+		continues to the next one, except an unconditional JUMP and RETURN,
+		jumps and calls also continue to their label. A call is assumed to
+		return, so the instruction after CALL is reachable too.
+		"""
+
+		order_list = sorted(self._instruction_list)
+		label_index = self.__label_index(order_list)
+
+		reachable = [False] * len(order_list)
+		pending = [0] if order_list else []
+
+		while pending:
+			index = pending.pop()
+			if index >= len(order_list) or reachable[index]:
+				continue
+			reachable[index] = True
+
+			opcode, args = self._instruction_list[order_list[index]]
+
+			if opcode in Optimizer.JUMPS and args[0][1] in label_index:
+				pending.append(label_index[args[0][1]])
+			if opcode != 'JUMP' and opcode != 'RETURN':
+				pending.append(index + 1)
+
+		for index, order in enumerate(order_list):
+			if not reachable[index]:
+				del self._instruction_list[order]
+				self._removed_count += 1
+
+	def __remove_unused_labels(self):
+		"""Removes labels which are not a target of any jump or call
+		"""
+
+		referenced = set(
+			args[0][1] for opcode, args in self._instruction_list.values()
+			if opcode in Optimizer.JUMPS
+		)
+
+		for order, (opcode, args) in list(self._instruction_list.items()):
+			if opcode == 'LABEL' and args[0][1] not in referenced:
+				del self._instruction_list[order]
+				self._removed_count += 1
+
+	def __resolve_jump_labels(self):
+		"""Resolves jump labels to positions in the optimized program
+		"""
+
+		self._jump_label_list = self.__label_index(sorted(self._instruction_list))
+
+	def __label_index(self, order_list: list) -> dict:
+		"""Finds positions of labels in a program
+
+		Arguments:
+			order_list {list} -- sorted instruction orders
+
+		Returns:
+			dict -- label name to instruction index
+		"""
+
+		return {
+			self._instruction_list[order][1][0][1]: index
+			for index, order in enumerate(order_list)
+			if self._instruction_list[order][0] == 'LABEL'
+		}
+
+	def __fuse(self):
+		"""Replaces instruction pairs by superinstructions
+
+		The second instruction of a pair can only be reached from the first
+		one: jumps and returns continue after a LABEL or a CALL instruction,
+		neither of which starts a fused pair.
+		"""
+
+		order_list = sorted(self._instruction_list)
+		fused_list = dict(self._instruction_list)
+
+		index = 0
+		while index < len(order_list) - 1:
+			first = self._instruction_list[order_list[index]]
+			second = self._instruction_list[order_list[index + 1]]
+
+			fused = self.__fuse_pair(first, second)
+			if fused is None:
+				index += 1
+				continue
+
+			fused_list[order_list[index]] = fused
+			self._fused_count += 1
+
+			# Second instruction of a pair can not start another one
+			index += 2
+
+		self._instruction_list = fused_list
+
+	def __fuse_pair(self, first: tuple, second: tuple) -> tuple:
+		"""Creates a superinstruction of two consecutive instructions
+
+		Arguments:
+			first {tuple} -- first instruction (opcode, arguments)
+			second {tuple} -- second instruction (opcode, arguments)
+
+		Returns:
+			tuple -- fused instruction, None if the pair can not be fused
+		"""
+
+		opcode1, args1 = first
+		opcode2, args2 = second
+
+		if opcode1 in Optimizer.COMPARISONS and opcode2 in Optimizer.CONDITIONAL_JUMPS:
+			expected = self.__jump_condition(args1[0], opcode2, args2)
+			if expected is None:
+				return None
+
+			return (opcode1 + "_JUMPIF", args1 + [args2[0], ("bool", expected)])
+
+		if opcode1 == 'ADD' and opcode2 == 'JUMP':
+			return ('ADD_JUMP', args1 + args2)
+
+		if opcode1 == 'PUSHS' and opcode2 == 'POPS':
+			return ('PUSHS_POPS', args1 + args2)
+
+		return None
+
+	def __jump_condition(self, result_var: tuple, opcode: str, args: list) -> str:
+		"""Finds comparison result on which a conditional jump is taken
+
+		Arguments:
+			result_var {tuple} -- variable argument holding the comparison result
+			opcode {str} -- JUMPIFEQ or JUMPIFNEQ
+			args {list} -- conditional jump arguments
+
+		Returns:
+			str -- 'true' or 'false', None if the jump does not compare
+				   the result variable with a boolean constant
+		"""
+
+		operands = args[1:]
+		if result_var not in operands:
+			return None
+
+		constant = operands[1] if operands[0] == result_var else operands[0]
+		if constant[0] != "bool":
+			return None
+
+		taken_on_true = (constant[1] == "true") == (opcode == 'JUMPIFEQ')
+
+		return "true" if taken_on_true else "false"
+
+	@property
+	def instruction_list(self):
+		return self._instruction_list
+
+	@property
+	def jump_label_list(self):
+		return self._jump_label_list
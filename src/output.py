@@ -0,0 +1,89 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		output.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Buffered program output
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import sys
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class OutputWriter():
+	"""Program output writer
+
+	Accumulates written values and passes them to the output stream
+	in one write once the buffered size reaches a threshold. The owner
+	is responsible for calling flush() when the program ends, including
+	on errors, so the output stays complete and ordered before any
+	error message. In unbuffered mode every value is written and flushed
+	immediately, which suits interactive use.
+	"""
+
+	DEFAULT_BUFFER_SIZE = 64 * 1024
+
+	def __init__(self, stream: object = None, buffer_size: int = DEFAULT_BUFFER_SIZE,
+				 buffered: bool = True):
+		self._stream = stream if stream is not None else sys.stdout
+		self._buffer_size = buffer_size
+		self._buffered = buffered and buffer_size > 0
+
+		self._buffer = list()
+		self._buffered_len = 0
+		self._position = 0
+
+	def write(self, text: str):
+		"""Writes text to the output
+
+		Arguments:
+			text {str} -- text to be written
+		"""
+
+		self._position += len(text)
+
+		if not self._buffered:
+			self._stream.write(text)
+			self._stream.flush()
+			return
+
+		self._buffer.append(text)
+		self._buffered_len += len(text)
+
+		if self._buffered_len >= self._buffer_size:
+			self.flush()
+
+	def flush(self):
+		"""Writes buffered text to the output stream
+		"""
+
+		if self._buffer:
+			self._stream.write("".join(self._buffer))
+			self._buffer.clear()
+			self._buffered_len = 0
+
+		self._stream.flush()
+
+	def continue_at(self, position: int):
+		"""Sets position of the output continuing an earlier run
+
+		Arguments:
+			position {int} -- number of characters written before
+		"""
+
+		self._position = position
+
+	@property
+	def position(self):
+		return self._position
@@ -15,20 +15,30 @@
 #	Imports
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-import xml.etree.ElementTree as ET
 import re
+import xml.etree.ElementTree as ET
+
+from sys import intern
 
 from src.exceptions import *
 from src.debug import Debug
 from src.constants import Constant
+from src.strings import String
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #	Code
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 class Parser():
-	def __init__(self, source_file: str):
+
+	# Type regexes compiled once, at import of the parser
+	TYPE_VALUE_PATTERN = {
+		arg_type: re.compile(regex) for arg_type, regex in Constant.TYPE_VALUE_REGEX.items()
+	}
+
+	def __init__(self, source_file: str, streaming: bool = False):
 		self._source_file = source_file
+		self._streaming = streaming
 		self._program_root = None
 		self._instruction_list = dict()
 		self._jump_label_list = dict()
@@ -37,13 +47,18 @@ class Parser():
 		"""Executes parsing process
 		"""
 
-		Debug.printd("Parser -> START")
+		Debug.printd("Parser -> START", category=Debug.PARSER)
 		try:
-			self.__load_source()
-			self.__parse_source()
-			Debug.pprintd(self._instruction_list)
-		except InterpreterError:
-			raise
+			if self._streaming:
+				self.__stream_source()
+			else:
+				self.__load_source()
+				self.__parse_source()
+			self.__resolve_jump_labels()
+			Debug.pprintd(self._instruction_list, category=Debug.PARSER)
+		finally:
+			# The XML tree is not needed once instructions are extracted
+			self._program_root = None
 	
 	def __load_source(self):
 		"""Loads source XML file
@@ -61,6 +76,43 @@ class Parser():
 		except ET.ParseError:
 			raise XMLFormatError("unable to parse")
 
+	def __stream_source(self):
+		"""Loads and parses source XML file incrementally
+
+		Elements are validated as soon as they are read and cleared
+		afterwards, so the whole XML tree is never held in memory and
+		invalid instructions are reported without reading the rest of
+		the file.
+		
+		Raises:
+			InputFileError -- File not found
+			XMLFormatError -- Unable to parse
+		"""
+
+		depth = 0
+		debug = Debug.enabled(Debug.PARSER)
+
+		try:
+			for event, element in ET.iterparse(self._source_file, events=("start", "end")):
+				if event == "start":
+					if depth == 0:
+						self._program_root = element
+						self.__check_source_root()
+					depth += 1
+					continue
+
+				depth -= 1
+				if depth == 1:
+					if debug:
+						Debug.printd("Processing instruction '{}'".format(element.get("opcode")),
+									 category=Debug.PARSER)
+					self.__add_instruction(element)
+					self._program_root.clear()
+		except FileNotFoundError:
+			raise InputFileError("not found")
+		except ET.ParseError:
+			raise XMLFormatError("unable to parse")
+
 	def __parse_source(self):
 		"""Parses source file
 
@@ -69,11 +121,8 @@ class Parser():
 		and list of labels
 		"""
 
-		try:
-			self.__check_source_root()
-			self.__add_instructions()
-		except InterpreterError:
-			raise
+		self.__check_source_root()
+		self.__add_instructions()
 
 	def __check_source_root(self):
 		"""Checks XML root tag (program)
@@ -94,16 +143,30 @@ class Parser():
 		if source_language != "IPPcode18":
 			raise ParserError("unknown language '{}'".format(source_language))
 
+	def __resolve_jump_labels(self):
+		"""Resolves jump labels to positions in the execution order
+
+		Labels are collected with their instruction order value, which
+		is translated here, once, to the index of the instruction within
+		the list of instructions sorted by order.
+		"""
+
+		order_index = {order: index for index, order in enumerate(sorted(self._instruction_list))}
+
+		for label, order in self._jump_label_list.items():
+			self._jump_label_list[label] = order_index[order]
+
 	def __add_instructions(self):
 		"""Loops through instructions in file
 		"""
 
+		debug = Debug.enabled(Debug.PARSER)
+
 		for instr in self._program_root:
-			Debug.printd("Processing instruction '{}'".format(instr.get("opcode")))
-			try:
-				self.__add_instruction(instr)
-			except InterpreterError:
-				raise
+			if debug:
+				Debug.printd("Processing instruction '{}'".format(instr.get("opcode")),
+							 category=Debug.PARSER)
+			self.__add_instruction(instr)
 
 	def __add_instruction(self, instr: object):
 		"""Checks individual instructions
@@ -118,12 +181,9 @@ class Parser():
 		if len(instr.items()) != 2:
 			raise XMLFormatError("wrong number of attributes, expected 'order' and 'opcode'")
 
-		try:
-			order = self.__extract_instr_order(instr)
-			opcode = self.__extract_instr_opcode(instr)
-			arguments = self.__extract_instr_arguments(instr)
-		except InterpreterError:
-			raise
+		order = self.__extract_instr_order(instr)
+		opcode = self.__extract_instr_opcode(instr)
+		arguments = self.__extract_instr_arguments(instr)
 
 		self._instruction_list[order] = (opcode, arguments)	
 
@@ -209,12 +269,9 @@ class Parser():
 
 		for i in range(instr_arg_count):
 			operand_type = ref_opcode_args[i]
-			try:
-				arg = self.__find_instr_arg(instr, str(i + 1))
-				arg_type = self.__extract_arg_type(instr, arg, operand_type)
-				arg_text = self.__extract_arg_value(instr, arg, arg_type)
-			except InterpreterError:
-				raise
+			arg = self.__find_instr_arg(instr, str(i + 1))
+			arg_type = self.__extract_arg_type(instr, arg, operand_type)
+			arg_text = self.__extract_arg_value(instr, arg, arg_type)
 
 			arguments.append((arg_type, arg_text))
 		
@@ -300,42 +357,45 @@ class Parser():
 			ParserError -- Invalid argument's content
 		
 		Returns:
-			str -- argument value
+			str -- argument value, variables are split into
+				   a tuple of frame type and variable name
 		"""
 
-		arg_value_regex = Constant.TYPE_VALUE_REGEX[arg_type]
 		arg_value = arg.text if arg.text != None else ""
 
-		if not re.match(arg_value_regex, arg_value):
-			raise ParserError(
-				"content of an argument does not match its type '{}' on instruction {}".format(
-					arg_type, instr.get("order"))
-			)
+		if arg_type == "string":
+			# Validation and escape sequence decoding are done in one pass
+			string = String.parse(arg_value)
+			if string is None:
+				self.__raise_invalid_value(instr, arg_type)
+			return string
+
+		if not Parser.TYPE_VALUE_PATTERN[arg_type].match(arg_value):
+			self.__raise_invalid_value(instr, arg_type)
 		
 		if arg_type == "int":
 			return int(arg_value)
-		elif arg_type == "string":
-			return self.__replace_escapes(arg_value)
+		elif arg_type == "var":
+			frame_type, var_name = arg_value.split('@')
+			return (Constant.FRAME_TYPES[frame_type], intern(var_name))
 		else:
 			return arg_value
 
-	def __replace_escapes(self, string: str) -> str:
-		"""Substitutes all escape sequences within a string for corresponding characters
+	def __raise_invalid_value(self, instr: object, arg_type: str):
+		"""Reports argument's content not matching its type
 		
 		Arguments:
-			string {str} -- Input string with escape sequences
+			instr {object} -- instruction xml object
+			arg_type {str} -- type of an argument
 		
-		Returns:
-			str -- String with replaced escape sequences
+		Raises:
+			ParserError -- Invalid argument's content
 		"""
 
-		pattern = re.compile(r"\\\d{3}")
-		matches = pattern.findall(string)
-		for match in matches:
-			replacement = chr(int(match[2:]))
-			string = pattern.sub(replacement, string)
-
-		return string
+		raise ParserError(
+			"content of an argument does not match its type '{}' on instruction {}".format(
+				arg_type, instr.get("order"))
+		)
 
 	@property
 	def instruction_list(self):
@@ -0,0 +1,165 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		profiler.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Execution profile of an interpreted program
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import json
+
+from sys import stderr
+
+from src.optimizer import Optimizer
+from src.exceptions import OutputFileError
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Profiler():
+	"""Execution profiler
+
+	Collects execution counts and cumulative time of every instruction of
+	a compiled program and taken / not taken counts of jumps. Counters are
+	plain lists indexed by the instruction index, they are filled in by
+	the instrumented interpreter loop.
+
+	The report is printed to the standard error output, or written as JSON
+	into a given file.
+	"""
+
+	# Instructions which may change the instruction head
+	JUMP_OPCODES = frozenset((
+		'JUMP', 'JUMPIFEQ', 'JUMPIFNEQ', 'CALL', 'RETURN',
+		'LT_JUMPIF', 'GT_JUMPIF', 'EQ_JUMPIF', 'ADD_JUMP',
+		'JUMPIFEQ_UNCHECKED', 'JUMPIFNEQ_UNCHECKED', 'LT_JUMPIF_UNCHECKED',
+		'GT_JUMPIF_UNCHECKED', 'EQ_JUMPIF_UNCHECKED', 'ADD_JUMP_UNCHECKED'
+	))
+
+	# Number of the hottest instructions listed in the text report
+	TOP_INSTRUCTIONS = 20
+
+	def __init__(self, order_list: list, opcode_list: list, output_file: str = ""):
+		self._order_list = order_list
+		self._opcode_list = opcode_list
+		self._output_file = output_file
+
+		self.counts = [0] * len(order_list)
+		self.times = [0] * len(order_list)
+		self.taken = [0] * len(order_list)
+
+		# Instruction index after an instruction if it does not jump,
+		# a superinstruction (also an unchecked one) moves the head to its
+		# second instruction
+		self.fallthrough = [
+			index + 1 if Profiler.__base_opcode(opcode) in Optimizer.SUPERINSTRUCTIONS else index
+			for index, opcode in enumerate(opcode_list)
+		]
+
+	@staticmethod
+	def __base_opcode(opcode: str) -> str:
+		"""Returns opcode without the suffix of unchecked variants
+
+		Arguments:
+			opcode {str} -- compiled opcode
+
+		Returns:
+			str -- opcode with type checks
+		"""
+
+		if opcode.endswith(Optimizer.UNCHECKED_SUFFIX):
+			return opcode[:-len(Optimizer.UNCHECKED_SUFFIX)]
+
+		return opcode
+
+	def report(self):
+		"""Prints the report or writes it into the output file
+
+		Raises:
+			OutputFileError -- unable to write the output file
+		"""
+
+		if not self._output_file:
+			self.__print_report()
+			return
+
+		try:
+			with open(self._output_file, "w") as f:
+				json.dump(self.__profile(), f, indent=2)
+		except OSError:
+			raise OutputFileError("profile '{}'".format(self._output_file))
+
+	def __profile(self) -> dict:
+		"""Summarizes collected counters
+
+		Returns:
+			dict -- totals, opcodes and instructions sorted by time
+		"""
+
+		opcodes = dict()
+		instructions = list()
+
+		for index, count in enumerate(self.counts):
+			if not count:
+				continue
+
+			opcode = self._opcode_list[index]
+			opcode_stats = opcodes.setdefault(opcode, {"opcode": opcode, "count": 0, "time_ns": 0})
+			opcode_stats["count"] += count
+			opcode_stats["time_ns"] += self.times[index]
+
+			instruction = {
+				"order": self._order_list[index],
+				"opcode": opcode,
+				"count": count,
+				"time_ns": self.times[index]
+			}
+			if opcode in Profiler.JUMP_OPCODES:
+				instruction["taken"] = self.taken[index]
+				instruction["not_taken"] = count - self.taken[index]
+
+			instructions.append(instruction)
+
+		by_time = lambda stats: stats["time_ns"]
+
+		return {
+			"instructions_executed": sum(self.counts),
+			"time_ns": sum(self.times),
+			"opcodes": sorted(opcodes.values(), key=by_time, reverse=True),
+			"instructions": sorted(instructions, key=by_time, reverse=True)
+		}
+
+	def __print_report(self):
+		"""Prints sorted report to the standard error output
+		"""
+
+		profile = self.__profile()
+		total_time = profile["time_ns"] or 1
+
+		print("Profile: {} instructions executed in {:.3f} ms".format(
+			profile["instructions_executed"], profile["time_ns"] / 1e6), file=stderr)
+
+		print("\n{:<20} {:>12} {:>12} {:>10} {:>7}".format(
+			"opcode", "count", "time [ms]", "avg [ns]", "time %"), file=stderr)
+		for stats in profile["opcodes"]:
+			print("{:<20} {:>12} {:>12.3f} {:>10.0f} {:>6.1f}%".format(
+				stats["opcode"], stats["count"], stats["time_ns"] / 1e6,
+				stats["time_ns"] / stats["count"], 100 * stats["time_ns"] / total_time), file=stderr)
+
+		print("\n{:>8} {:<20} {:>12} {:>12} {:>7} {:>12} {:>12}".format(
+			"order", "opcode", "count", "time [ms]", "time %", "taken", "not taken"), file=stderr)
+		for stats in profile["instructions"][:Profiler.TOP_INSTRUCTIONS]:
+			print("{:>8} {:<20} {:>12} {:>12.3f} {:>6.1f}% {:>12} {:>12}".format(
+				stats["order"], stats["opcode"], stats["count"], stats["time_ns"] / 1e6,
+				100 * stats["time_ns"] / total_time, stats.get("taken", ""),
+				stats.get("not_taken", "")), file=stderr)
@@ -0,0 +1,257 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		server.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Long-lived interpreter server running jobs from a socket or stdin
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import json
+import os
+import signal
+import stat
+import sys
+
+from io import BytesIO, StringIO, TextIOWrapper
+from socketserver import UnixStreamServer, StreamRequestHandler
+
+from src.interpreter import Interpreter
+from src.parser import Parser
+from src.optimizer import Optimizer
+from src.cache import ProgramLRUCache
+from src.output import OutputWriter
+from src.input import InputReader
+from src.exceptions import *
+from src.debug import Debug
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Server():
+	"""Interpreter server
+
+	Runs jobs sent as JSON objects, one per line, and answers each of them
+	with one JSON line. Jobs are read from the standard input, or from
+	connections to a Unix socket if its path is given.
+
+	Job: {"id": any, "source": "<file>" or "xml": "<XML source>",
+		  "input": "<program input>", "opt_level": <n>,
+		  "max_instructions": <n>, "timeout": <seconds>}
+	Result: {"id": any, "output": "<program output>", "code": <exit code>,
+			 "error": "<error message>" or null}
+
+	Parsed programs are kept in an LRU cache keyed by the source hash,
+	every job is run by a new Interpreter, so no state is shared between
+	jobs. Execution limits of the server apply to jobs which do not set
+	their own, so a looping program can not block the server.
+	"""
+
+	def __init__(self, socket_path: str = "", opt_level: int = Optimizer.DEFAULT_LEVEL,
+				 cache_size: int = ProgramLRUCache.DEFAULT_CAPACITY,
+				 max_instructions: int = None, timeout: float = None):
+		self._socket_path = socket_path
+		self._opt_level = opt_level
+		self._max_instructions = max_instructions
+		self._timeout = timeout
+		self._programs = ProgramLRUCache(cache_size)
+
+	def run(self):
+		"""Serves jobs until the input ends or the server is interrupted
+		"""
+
+		if not self._socket_path:
+			self.serve(sys.stdin, sys.stdout)
+			return
+
+		self.__remove_socket()
+		server = UnixStreamServer(self._socket_path, self.__request_handler())
+
+		# Terminated server removes its socket as if it was interrupted
+		signal.signal(signal.SIGTERM, self.__terminate)
+
+		Debug.printd("Server -> LISTENING", self._socket_path)
+		try:
+			server.serve_forever()
+		except KeyboardInterrupt:
+			pass
+		finally:
+			server.server_close()
+			self.__remove_socket()
+
+	def serve(self, jobs: object, results: object):
+		"""Runs jobs read from a stream and writes their results
+
+		Arguments:
+			jobs {object} -- text stream of JSON jobs, one per line
+			results {object} -- text stream for JSON results
+		"""
+
+		for line in jobs:
+			if not line.strip():
+				continue
+
+			results.write(json.dumps(self.handle(line)) + "\n")
+			results.flush()
+
+	def handle(self, line: str) -> dict:
+		"""Runs a single job
+
+		Arguments:
+			line {str} -- JSON job
+
+		Returns:
+			dict -- job result
+		"""
+
+		try:
+			job = self.__decode_job(line)
+		except InterpreterError as e:
+			return {"id": None, "output": "", "code": e.code, "error": str(e)}
+
+		return self.run_job(job)
+
+	def run_job(self, job: dict) -> dict:
+		"""Runs a decoded job
+
+		Arguments:
+			job {dict} -- job with either 'source' or 'xml'
+
+		Returns:
+			dict -- job result
+		"""
+
+		output = StringIO()
+		result = {"id": job.get("id"), "output": "", "code": 0, "error": None}
+
+		try:
+			Interpreter(
+				job.get("source", "<xml>"),
+				output=OutputWriter(output),
+				input_reader=InputReader(StringIO(job.get("input", ""))),
+				opt_level=job.get("opt_level", self._opt_level),
+				parsed_program=self.__parsed_program(job),
+				max_instructions=job.get("max_instructions", self._max_instructions),
+				timeout=job.get("timeout", self._timeout)
+			).run()
+		except InterpreterError as e:
+			result["code"] = e.code
+			result["error"] = str(e)
+		except Exception as e:
+			# A failing job must not stop the server
+			result["code"] = ExitCode.INTERNAL_ERROR
+			result["error"] = "{}: {}".format(type(e).__name__, e)
+
+		result["output"] = output.getvalue()
+		return result
+
+	def __decode_job(self, line: str) -> dict:
+		"""Decodes and validates a job
+
+		Arguments:
+			line {str} -- JSON job
+
+		Raises:
+			ArgumentsError -- invalid job
+
+		Returns:
+			dict -- job
+		"""
+
+		try:
+			job = json.loads(line)
+		except ValueError:
+			raise ArgumentsError("job is not a valid JSON")
+
+		if not isinstance(job, dict) or ("source" in job) == ("xml" in job):
+			raise ArgumentsError("job has to contain either 'source' or 'xml'")
+
+		opt_level = job.get("opt_level", self._opt_level)
+		if not isinstance(opt_level, int) or not 0 <= opt_level <= Optimizer.MAX_LEVEL:
+			raise ArgumentsError("optimization level has to be 0 to {}".format(Optimizer.MAX_LEVEL))
+
+		max_instructions = job.get("max_instructions")
+		if max_instructions is not None and (
+				not isinstance(max_instructions, int) or max_instructions < 1):
+			raise ArgumentsError("instruction limit has to be positive")
+
+		timeout = job.get("timeout")
+		if timeout is not None and (not isinstance(timeout, (int, float)) or not timeout > 0):
+			raise ArgumentsError("timeout has to be positive")
+
+		return job
+
+	def __parsed_program(self, job: dict) -> tuple:
+		"""Returns parsed program of a job, parses it only if not cached
+
+		Arguments:
+			job {dict} -- job
+
+		Raises:
+			InputFileError -- source file can not be read
+
+		Returns:
+			tuple -- instruction list and jump label list
+		"""
+
+		if "xml" in job:
+			source = job["xml"].encode()
+		else:
+			try:
+				with open(job["source"], "rb") as f:
+					source = f.read()
+			except OSError:
+				raise InputFileError("'{}' not found".format(job["source"]))
+
+		key = ProgramLRUCache.key(source)
+		program = self._programs.get(key)
+		if program is not None:
+			return program
+
+		parser = Parser(BytesIO(source))
+		parser.run()
+
+		program = (parser.instruction_list, parser.jump_label_list)
+		self._programs.put(key, program)
+
+		return program
+
+	def __request_handler(self) -> type:
+		"""Creates handler of socket connections serving jobs by this server
+
+		Returns:
+			type -- request handler class
+		"""
+
+		server = self
+
+		class JobHandler(StreamRequestHandler):
+			def handle(self):
+				server.serve(
+					TextIOWrapper(self.rfile, encoding="utf-8"),
+					TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+				)
+
+		return JobHandler
+
+	def __terminate(self, signum: int, frame: object):
+		raise KeyboardInterrupt()
+
+	def __remove_socket(self):
+		"""Removes a stale socket file left at the socket path
+		"""
+
+		try:
+			if stat.S_ISSOCK(os.stat(self._socket_path).st_mode):
+				os.remove(self._socket_path)
+		except FileNotFoundError:
+			pass
@@ -0,0 +1,85 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		strings.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Validation and decoding of IPPcode18 string literals
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import re
+
+from functools import lru_cache
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class String():
+	"""String literal decoder
+
+	Validates IPPcode18 string literals and decodes their escape
+	sequences. Generated programs repeat the same literals many times, so
+	literals of a parsed program are decoded by the memoized parse().
+	"""
+
+	# Characters allowed in a string literal, including escape backslashes
+	CHARS_REGEX = re.compile(r"[\w -~]*")
+
+	ESCAPE = "\\"
+	ESCAPE_LEN = 3
+
+	CACHE_SIZE = 4096
+
+	@staticmethod
+	def decode(text: str) -> str:
+		"""Validates a string literal and decodes its escape sequences
+
+		Allowed characters are checked by a single scan of the whole literal.
+		The literal is then split at backslashes and one pass over the parts
+		both checks that every part starts with a three digit escape code and
+		decodes it by a table lookup, so the cost is linear in the literal
+		length. The literal must not end with a whitespace.
+
+		Arguments:
+			text {str} -- string literal as written in the source
+
+		Returns:
+			str -- decoded string, None if the literal is invalid
+		"""
+
+		if text.endswith(" ") or not String.CHARS_REGEX.fullmatch(text):
+			return None
+		if String.ESCAPE not in text:
+			return text
+
+		parts = text.split(String.ESCAPE)
+		decoded = [parts[0]]
+
+		for part in parts[1:]:
+			char = String.ESCAPE_CHARS.get(part[:String.ESCAPE_LEN])
+
+			if char is None:
+				return None
+
+			decoded.append(char)
+			decoded.append(part[String.ESCAPE_LEN:])
+
+		return "".join(decoded)
+
+
+# Decoded character of every escape code, e.g. '032' -> ' '
+String.ESCAPE_CHARS = {
+	"{:0{}d}".format(code, String.ESCAPE_LEN): chr(code) for code in range(10 ** String.ESCAPE_LEN)
+}
+
+# Memoized variant of String.decode() used for literals of a parsed program
+String.parse = staticmethod(lru_cache(maxsize=String.CACHE_SIZE)(String.decode))
@@ -0,0 +1,155 @@
+# ======================================================================
+#	@Author: 	Ivan Hazucha
+#	@File: 		value.py
+#	@Date: 		10/04/2018
+#
+#	@Assignment: IPPcode18 3-address code XML representation interpreter
+#
+#	@brief Typed values stored in frames and on the data stack
+#
+#	TODO: __blank__
+#
+# ======================================================================
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Imports
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#	Code
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Type:
+	"""Value type tags
+
+	Small integer tags of runtime value types, NIL marks a defined
+	but uninitialized variable
+	"""
+
+	NIL = 0
+	INT = 1
+	BOOL = 2
+	STRING = 3
+
+	NAMES = ("", "int", "bool", "string")
+
+	FROM_NAME = {
+		'int': INT,
+		'bool': BOOL,
+		'string': STRING,
+	}
+
+
+class Value:
+	"""Typed value
+
+	Values are immutable, a single instance may be shared by several
+	variables and data stack entries. Booleans are stored as native
+	Python bools.
+	"""
+
+	__slots__ = ('type', 'value')
+
+	def __init__(self, type: int, value: object):
+		self.type = type
+		self.value = value
+
+	@property
+	def chars(self):
+		"""Indexable characters of a string value"""
+		return self.value
+
+	@staticmethod
+	def from_literal(arg_type: str, arg_value: object) -> 'Value':
+		"""Creates value from a parsed literal argument
+
+		Arguments:
+			arg_type {str} -- argument type name (int, bool or string)
+			arg_value {object} -- parsed argument value
+
+		Returns:
+			Value -- typed value
+		"""
+
+		if arg_type == "bool":
+			return Value.TRUE if arg_value == "true" else Value.FALSE
+
+		return Value(Type.FROM_NAME[arg_type], arg_value)
+
+	def __str__(self):
+		if self.type == Type.BOOL:
+			return "true" if self.value else "false"
+		return str(self.value)
+
+	def __repr__(self):
+		return "{}@{}".format(Type.NAMES[self.type] or "nil", self)
+
+
+Value.NIL = Value(Type.NIL, None)
+Value.TRUE = Value(Type.BOOL, True)
+Value.FALSE = Value(Type.BOOL, False)
+
+
+class StringBuffer(Value):
+	"""Mutable string value
+
+	Holds characters of a string in a list, so a character is read or
+	replaced in O(1) and appending is amortized O(1). The string itself
+	is joined only when its value is read and kept until the next change.
+
+	A buffer is owned by a single variable and changed in place only
+	by instructions writing back into the same variable (SETCHAR, CONCAT).
+	Instructions copying a value elsewhere (MOVE, PUSHS) store its frozen
+	copy instead.
+	"""
+
+	__slots__ = ('_chars', '_string')
+
+	def __init__(self, string: str):
+		self.type = Type.STRING
+		self._chars = list(string)
+		self._string = string
+
+	@property
+	def value(self):
+		if self._string is None:
+			self._string = "".join(self._chars)
+		return self._string
+
+	@property
+	def chars(self):
+		return self._chars
+
+	def set_char(self, index: int, char: str):
+		"""Replaces a character
+
+		Arguments:
+			index {int} -- character index
+			char {str} -- new character
+
+		Raises:
+			IndexError -- index out of range
+		"""
+
+		self._chars[index] = char
+		self._string = None
+
+	def append(self, string: str):
+		"""Appends a string
+
+		Arguments:
+			string {str} -- appended string
+		"""
+
+		self._chars.extend(string)
+		self._string = None
+
+	def freeze(self) -> Value:
+		"""Returns immutable copy of the value
+
+		Returns:
+			Value -- string value
+		"""
+
+		return Value(Type.STRING, self.value)